@@ -0,0 +1,338 @@
+"""
+구글 이미지 크롤러 - asyncio 버전
+이미지 다운로드는 aiohttp로 비동기 처리하고, Selenium 페이지 로드는 별도 스레드에서 실행합니다.
+"""
+
+import asyncio
+import functools
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import aiohttp
+
+from crawler import GoogleImageCrawler, ImageResult, ImageTooLargeError, InvalidImageError
+from image_info import FORMAT_EXTENSIONS, SNIFF_BYTES, image_format, is_image_content_type
+from http_client import USER_AGENT
+from rate_limiter import HostRateLimiter
+
+
+class AsyncGoogleImageCrawler:
+    """asyncio 기반 Google 이미지 크롤러"""
+    
+    def __init__(self, headless=True, max_concurrency=32, per_host_limit=8,
+                 max_image_bytes=20 * 1024 * 1024, chunk_size=64 * 1024, crawler=None,
+                 rate_limiter=None, connect_timeout=5.0, read_timeout=10.0, image_deadline=30.0):
+        """
+        크롤러 초기화 (브라우저는 start() 또는 async with 진입 시 실행)
+        
+        Args:
+            headless (bool): 브라우저 헤드리스 모드 여부 (기본값: True)
+            max_concurrency (int): 전체 동시 다운로드 수
+            per_host_limit (int): 호스트별 최대 동시 다운로드 수
+            max_image_bytes (int): 이미지 최대 크기, 초과 시 다운로드 중단
+            chunk_size (int): 스트리밍 다운로드 청크 크기
+            crawler (GoogleImageCrawler): 페이지 로드에 사용할 기존 크롤러 (선택)
+            rate_limiter (HostRateLimiter): 호스트별 요청 속도 제한 (None이면 전용 제한 생성)
+            connect_timeout (float): 이미지 서버 연결 타임아웃 (초)
+            read_timeout (float): 응답 데이터 사이 최대 대기 시간 (초)
+            image_deadline (float): 이미지 한 개의 전체 다운로드 제한 시간 (초, None이면 제한 없음)
+        """
+        self.headless = headless
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        self.max_image_bytes = max_image_bytes
+        self.chunk_size = chunk_size
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.image_deadline = image_deadline
+        
+        self.crawler = crawler
+        self._owns_crawler = crawler is None
+        self.session = None
+        
+        # Selenium 드라이버는 스레드 안전하지 않으므로 단일 스레드에서만 사용
+        self._driver_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="selenium")
+    
+    async def __aenter__(self):
+        await self.start()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def _run_driver(self, func, *args, **kwargs):
+        """Selenium 작업을 드라이버 전용 스레드에서 실행"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._driver_executor,
+            functools.partial(func, *args, **kwargs)
+        )
+    
+    async def start(self):
+        """브라우저 실행 및 HTTP 세션 생성"""
+        if self.crawler is None:
+            self.crawler = await self._run_driver(GoogleImageCrawler, headless=self.headless)
+        
+        if self.session is None:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_concurrency,
+                limit_per_host=self.per_host_limit
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                headers={"User-Agent": USER_AGENT},
+                # 요청 전체(연결부터 본문 끝까지)를 image_deadline으로 제한
+                timeout=aiohttp.ClientTimeout(
+                    total=self.image_deadline,
+                    sock_connect=self.connect_timeout,
+                    sock_read=self.read_timeout
+                )
+            )
+    
+    async def _download(self, image_url, save_path):
+        """
+        이미지 한 개를 임시 파일로 비동기 다운로드
+        
+        파일을 만들기 전에 Content-Type과 첫 청크의 매직 바이트를 확인하여
+        이미지가 아닌 응답은 나머지 본문을 받지 않고 실패로 처리합니다.
+        
+        Returns:
+            ImageResult: 성공 시 결과 (path는 임시 파일 경로), 실패 시 None
+        """
+        loop = asyncio.get_running_loop()
+        staging_path = os.path.join(save_path, f".{uuid.uuid4().hex}.tmp")
+        started = time.perf_counter()
+        
+        try:
+            # 호스트별 속도 제한 차례까지 대기 (이벤트 루프는 막지 않음)
+            delay = self.rate_limiter.reserve(image_url)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            
+            async with self.session.get(image_url, allow_redirects=True) as response:
+                self.rate_limiter.observe(image_url, response.status, response.headers.get("Retry-After"))
+                response.raise_for_status()
+                
+                content_type = response.headers.get("Content-Type")
+                if not is_image_content_type(content_type):
+                    raise InvalidImageError(f"이미지가 아닌 응답: {content_type}")
+                
+                if response.content_length and response.content_length > self.max_image_bytes:
+                    raise ImageTooLargeError(
+                        f"이미지 크기 초과: {response.content_length} > {self.max_image_bytes} bytes"
+                    )
+                
+                # 형식을 판별할 만큼 앞부분을 먼저 받아 확인
+                first_bytes = b""
+                while len(first_bytes) < SNIFF_BYTES:
+                    data = await response.content.readany()
+                    if not data:
+                        break
+                    first_bytes += data
+                
+                kind = image_format(first_bytes)
+                if kind is None:
+                    raise InvalidImageError(
+                        f"이미지가 아닌 응답: {content_type or '형식 알 수 없음'} ({first_bytes[:8]!r})"
+                    )
+                
+                # 파일 쓰기는 기본 실행기에서 처리하여 이벤트 루프를 막지 않음
+                f = await loop.run_in_executor(None, open, staging_path, 'wb')
+                total_bytes = len(first_bytes)
+                try:
+                    await loop.run_in_executor(None, f.write, first_bytes)
+                    async for chunk in response.content.iter_chunked(self.chunk_size):
+                        total_bytes += len(chunk)
+                        if total_bytes > self.max_image_bytes:
+                            raise ImageTooLargeError(
+                                f"이미지 크기 초과: {self.max_image_bytes} bytes 이상"
+                            )
+                        await loop.run_in_executor(None, f.write, chunk)
+                finally:
+                    await loop.run_in_executor(None, f.close)
+                
+                return ImageResult(
+                    image_url,
+                    staging_path,
+                    total_bytes,
+                    time.perf_counter() - started,
+                    response.status,
+                    content_type=content_type,
+                    format=kind
+                )
+        
+        except asyncio.CancelledError:
+            if os.path.exists(staging_path):
+                os.remove(staging_path)
+            raise
+        
+        except Exception as e:
+            print(f"이미지 다운로드 실패 ({image_url}): {e}")
+            if os.path.exists(staging_path):
+                os.remove(staging_path)
+            return None
+    
+    async def iter_images(self, keyword, num_images=50, save_dir="downloads"):
+        """
+        이미지를 다운로드하면서 저장된 순서대로 결과를 반환하는 비동기 제너레이터
+        
+        동기 크롤러와 같은 URL 인덱스(crawler.url_dedup 설정)로 이미 받은 URL을 건너뛰고,
+        기존 파일을 덮어쓰지 않도록 마지막 번호 다음부터 저장합니다.
+        
+        Args:
+            keyword (str): 검색 키워드
+            num_images (int): 다운로드할 이미지 개수
+            save_dir (str): 저장 디렉토리
+        
+        Yields:
+            ImageResult: 저장된 이미지 정보
+        """
+        await self.start()
+        
+        save_path = os.path.join(save_dir, keyword)
+        Path(save_path).mkdir(parents=True, exist_ok=True)
+        
+        downloaded_count = 0
+        page_start = 0
+        consecutive_failures = 0
+        pending = set()
+        
+        # 이전 실행에서 받은 URL과 이번 실행에서 시도한 URL은 건너뜀
+        url_index = self.crawler.get_url_index(save_dir)
+        dedup_keyword = keyword if self.crawler.url_dedup == "keyword" else None
+        attempted_urls = set()
+        
+        def is_new_url(url):
+            if url in attempted_urls:
+                return False
+            return url_index is None or not url_index.contains(url, dedup_keyword)
+        
+        # 기존 파일을 덮어쓰지 않도록 마지막 번호 다음부터 저장
+        index_offset = GoogleImageCrawler.get_last_file_index(save_path, keyword)
+        
+        try:
+            while downloaded_count < num_images and consecutive_failures < 3:
+                # 검색 페이지 로드 및 이미지 URL 추출 (드라이버 스레드에서 실행)
+                image_urls = await self._run_driver(
+                    self.crawler.load_page,
+                    keyword,
+                    page_start,
+                    target_count=num_images - downloaded_count,
+                    url_filter=is_new_url
+                )
+                attempted_urls.update(image_urls)
+                page_start += 30
+                
+                if len(image_urls) == 0:
+                    consecutive_failures += 1
+                    continue
+                else:
+                    consecutive_failures = 0
+                
+                url_iter = iter(image_urls)
+                while True:
+                    # 진행 중인 작업 수가 남은 목표 개수를 넘지 않도록 유지
+                    while downloaded_count + len(pending) < num_images:
+                        image_url = next(url_iter, None)
+                        if image_url is None:
+                            break
+                        pending.add(asyncio.create_task(self._download(image_url, save_path)))
+                    
+                    if not pending:
+                        break
+                    
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    
+                    for task in done:
+                        result = task.result()
+                        if result is None:
+                            continue
+                        
+                        if downloaded_count >= num_images:
+                            os.remove(result.path)
+                            continue
+                        
+                        # 완료 순서대로 번호 부여
+                        downloaded_count += 1
+                        file_extension = (
+                            FORMAT_EXTENSIONS.get(result.format)
+                            or GoogleImageCrawler.get_file_extension(result.url)
+                        )
+                        filename = f"{keyword}_{index_offset + downloaded_count}{file_extension}"
+                        file_path = os.path.join(save_path, filename)
+                        os.replace(result.path, file_path)
+                        if url_index is not None:
+                            url_index.add(result.url, keyword)
+                        
+                        yield result._replace(path=file_path)
+        
+        finally:
+            # 중단된 경우 남은 다운로드 취소 및 임시 파일 정리
+            for task in pending:
+                task.cancel()
+            for result in await asyncio.gather(*pending, return_exceptions=True):
+                if isinstance(result, ImageResult) and os.path.exists(result.path):
+                    os.remove(result.path)
+            if url_index is not None:
+                url_index.flush()
+    
+    async def crawl_images(self, keyword, num_images=50, save_dir="downloads"):
+        """
+        이미지 크롤링 실행
+        
+        Args:
+            keyword (str): 검색 키워드
+            num_images (int): 다운로드할 이미지 개수
+            save_dir (str): 저장 디렉토리
+        
+        Returns:
+            int: 다운로드한 이미지 개수
+        """
+        save_path = os.path.join(save_dir, keyword)
+        
+        print(f"'{keyword}' 이미지 크롤링 시작...")
+        print(f"저장 경로: {save_path}")
+        print(f"목표 이미지 개수: {num_images}")
+        
+        downloaded_count = 0
+        
+        try:
+            async for result in self.iter_images(keyword, num_images, save_dir):
+                downloaded_count += 1
+                print(f"[{downloaded_count}/{num_images}] {os.path.basename(result.path)} 다운로드 완료")
+        
+        except Exception as e:
+            print(f"크롤링 중 오류 발생: {e}")
+        
+        finally:
+            print(f"\n크롤링 완료!")
+            print(f"총 {downloaded_count}개의 이미지 다운로드됨")
+            print(f"저장 위치: {os.path.abspath(save_path)}")
+        
+        return downloaded_count
+    
+    async def close(self):
+        """HTTP 세션 및 드라이버 종료"""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+        
+        if self.crawler is not None and self._owns_crawler:
+            await self._run_driver(self.crawler.close)
+            self.crawler = None
+        
+        self._driver_executor.shutdown(wait=False)
+
+
+async def main():
+    """메인 함수"""
+    async with AsyncGoogleImageCrawler(headless=True) as crawler:
+        await crawler.crawl_images(keyword="고양이", num_images=50)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
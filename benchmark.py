@@ -0,0 +1,165 @@
+"""
+이미지 URL 추출 벤치마크
+저장된 검색 결과 페이지(fixture)에서 추출 방식별 속도를 비교합니다.
+
+사용법:
+    python3 benchmark.py                       # 합성 fixture 페이지로 비교
+    python3 benchmark.py --fixture page.html   # 저장된 페이지로 비교
+    python3 benchmark.py --save-fixture 고양이 --fixture page.html  # 실제 검색 페이지 저장
+    python3 benchmark.py --offline --fixture page.html  # 브라우저 없이 HTML 파서만 측정
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from crawler import GoogleImageCrawler
+from image_extractor import extract_image_urls
+
+
+def make_fixture_page(file_path, num_images=400):
+    """
+    Google 이미지 검색 결과와 비슷한 구조의 합성 페이지 생성
+    
+    Args:
+        file_path (str): 저장할 HTML 파일 경로
+        num_images (int): 섬네일 개수
+    """
+    items = []
+    for i in range(num_images):
+        kind = i % 4
+        if kind == 0:
+            img = f'<img class="rg_i Q4LuWd" src="https://encrypted-tbn0.gstatic.com/images?q=tbn:{i}">'
+        elif kind == 1:
+            img = f'<img class="rg_i" src="data:image/gif;base64,R0lGOD" data-src="https://example.com/{i}.jpg">'
+        elif kind == 2:
+            img = f'<img class="rg_i" data-iurl="https://cdn.example.org/img/{i}.png">'
+        else:
+            img = (
+                f'<a href="/imgres?imgurl=https://photos.example.net/{i}.webp&amp;imgrefurl=x">'
+                f'<img class="Q4LuWd"></a>'
+            )
+        items.append(f'<div class="isv-r">{img}</div>')
+    
+    html = "<html><head><meta charset='utf-8'></head><body>\n" + "\n".join(items) + "\n</body></html>"
+    Path(file_path).write_text(html, encoding="utf-8")
+
+
+def save_fixture_page(crawler, keyword, file_path):
+    """
+    실제 검색 결과 페이지를 스크롤한 뒤 HTML로 저장
+    
+    Args:
+        crawler (GoogleImageCrawler): 크롤러
+        keyword (str): 검색 키워드
+        file_path (str): 저장할 HTML 파일 경로
+    """
+    crawler.load_page(keyword)
+    Path(file_path).write_text(crawler.driver.page_source, encoding="utf-8")
+    print(f"fixture 저장: {file_path}")
+
+
+def time_call(func, repeat):
+    """함수를 여러 번 실행하여 (결과, 실행 시간 리스트) 반환"""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - started)
+    return result, timings
+
+
+def benchmark_extraction(crawler, fixture_path, repeat=3):
+    """
+    fixture 페이지에서 추출 방식별 실행 시간 비교
+    
+    Args:
+        crawler (GoogleImageCrawler): 크롤러
+        fixture_path (str): HTML fixture 경로
+        repeat (int): 반복 횟수
+    
+    Returns:
+        dict: {방식: 중앙값 실행 시간(초)}
+    """
+    crawler.driver.get(Path(fixture_path).resolve().as_uri())
+    
+    methods = {
+        "요소별 호출 (legacy)": crawler.get_image_urls_legacy,
+        "단일 execute_script": crawler.get_image_urls,
+        "page_source + HTML 파서": lambda: extract_image_urls(crawler.driver.page_source),
+    }
+    
+    results = {}
+    medians = {}
+    for name, func in methods.items():
+        urls, timings = time_call(func, repeat)
+        results[name] = urls
+        medians[name] = statistics.median(timings)
+        print(f"{name:<24} {len(urls):>5}개 URL  중앙값 {medians[name] * 1000:9.1f} ms")
+    
+    baseline = medians["요소별 호출 (legacy)"]
+    fast = medians["단일 execute_script"]
+    if fast > 0:
+        print(f"속도 향상: {baseline / fast:.1f}배")
+    
+    if set(results["요소별 호출 (legacy)"]) != set(results["단일 execute_script"]):
+        print("⚠️  추출 결과가 서로 다릅니다.")
+    
+    return medians
+
+
+def benchmark_offline(fixture_path, repeat=3):
+    """
+    브라우저 없이 HTML 파서 추출 시간 측정
+    
+    Args:
+        fixture_path (str): HTML fixture 경로
+        repeat (int): 반복 횟수
+    
+    Returns:
+        float: 중앙값 실행 시간(초)
+    """
+    html = Path(fixture_path).read_text(encoding="utf-8")
+    urls, timings = time_call(lambda: extract_image_urls(html), repeat)
+    median = statistics.median(timings)
+    print(f"{'HTML 파서 (오프라인)':<24} {len(urls):>5}개 URL  중앙값 {median * 1000:9.1f} ms")
+    return median
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="이미지 URL 추출 벤치마크")
+    parser.add_argument("--fixture", help="HTML fixture 경로 (없으면 합성 페이지 생성)")
+    parser.add_argument("--images", type=int, default=400, help="합성 페이지의 섬네일 개수")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수")
+    parser.add_argument("--save-fixture", metavar="KEYWORD", help="실제 검색 페이지를 fixture로 저장")
+    parser.add_argument("--offline", action="store_true", help="브라우저 없이 HTML 파서만 측정")
+    args = parser.parse_args()
+    
+    fixture_path = args.fixture
+    if fixture_path is None:
+        fixture_path = os.path.join(tempfile.mkdtemp(), "fixture.html")
+        if not args.save_fixture:
+            make_fixture_page(fixture_path, args.images)
+            print(f"합성 fixture 생성: {fixture_path} ({args.images}개 섬네일)")
+    
+    if args.offline:
+        benchmark_offline(fixture_path, args.repeat)
+        return
+    
+    crawler = GoogleImageCrawler(headless=True)
+    
+    try:
+        if args.save_fixture:
+            save_fixture_page(crawler, args.save_fixture, fixture_path)
+        benchmark_extraction(crawler, fixture_path, args.repeat)
+    finally:
+        crawler.close()
+
+
+if __name__ == "__main__":
+    main()
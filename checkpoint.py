@@ -0,0 +1,175 @@
+"""
+크롤링 작업 체크포인트
+진행 상황을 저장 디렉토리의 JSONL 저널에 조금씩 추가 기록해 두고,
+중단된 작업을 멈춘 지점부터 이어서 실행할 수 있게 합니다.
+"""
+
+import json
+import os
+import threading
+import time
+
+
+class CrawlCheckpoint:
+    """
+    키워드 하나의 크롤링 작업 상태 저널
+    
+    저장 경로의 .crawl_state.jsonl에 이벤트를 한 줄씩 추가만 하므로 기록 비용이
+    작고, 중간에 프로세스가 죽어도 마지막으로 기록된 줄까지의 상태가 남습니다.
+    
+    이벤트 종류:
+        start: 새 작업 시작 (목표 개수, 파일 번호 시작값)
+        saved / duplicate / failed: 이미지별 결과 (이어받기 시 다시 시도하지 않음)
+        page: 페이지 처리 완료 (다음 페이지 위치, 연속 실패 횟수)
+        done: 목표 개수 달성
+    """
+    
+    FILE_NAME = ".crawl_state.jsonl"
+    
+    def __init__(self, save_path, flush_every=20):
+        """
+        체크포인트 열기 (기존 저널이 있으면 상태 복원)
+        
+        Args:
+            save_path (str): 이미지 저장 경로
+            flush_every (int): 이 개수만큼 기록될 때마다 파일에 반영
+        """
+        self.file_path = os.path.join(save_path, self.FILE_NAME)
+        self.flush_every = flush_every
+        
+        self._lock = threading.Lock()
+        self._file = None
+        self._unflushed = 0
+        
+        self._reset_state()
+        self._load()
+    
+    def _reset_state(self):
+        """상태 초기화"""
+        self.num_images = 0
+        self.index_offset = 0
+        self.page_start = 0
+        self.consecutive_failures = 0
+        self.downloaded = 0
+        self.consumed_urls = set()
+        self.failures = {}
+        self.completed = False
+        self.started = False
+    
+    def _apply(self, record):
+        """이벤트 하나를 상태에 반영"""
+        event = record.get("event")
+        
+        if event == "start":
+            self._reset_state()
+            self.started = True
+            self.num_images = record["num_images"]
+            self.index_offset = record["index_offset"]
+        elif event == "saved":
+            self.downloaded += 1
+            self.consumed_urls.add(record["url"])
+        elif event == "duplicate":
+            self.consumed_urls.add(record["url"])
+        elif event == "failed":
+            self.consumed_urls.add(record["url"])
+            self.failures[record["url"]] = record.get("error", "")
+        elif event == "page":
+            self.page_start = record["page_start"]
+            self.consecutive_failures = record["consecutive_failures"]
+        elif event == "done":
+            self.completed = True
+    
+    def _load(self):
+        """저널을 처음부터 다시 읽어 마지막 상태 복원"""
+        if not os.path.exists(self.file_path):
+            return
+        
+        with open(self.file_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    self._apply(json.loads(line))
+                except (ValueError, KeyError):
+                    # 기록 도중 중단된 마지막 줄은 무시
+                    break
+    
+    @property
+    def resumable(self):
+        """이어서 실행할 수 있는 미완료 작업이 있는지 여부"""
+        return self.started and not self.completed
+    
+    def _write(self, record, flush=False):
+        """이벤트 기록"""
+        with self._lock:
+            self._apply(record)
+            if self._file is None:
+                self._file = open(self.file_path, "a", encoding="utf-8")
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            
+            self._unflushed += 1
+            if flush or self._unflushed >= self.flush_every:
+                self._file.flush()
+                self._unflushed = 0
+    
+    def start(self, num_images, index_offset):
+        """
+        새 작업 시작 (이전 저널은 지움)
+        
+        Args:
+            num_images (int): 목표 이미지 개수
+            index_offset (int): 파일 번호 시작값
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+            self._file = open(self.file_path, "w", encoding="utf-8")
+            self._unflushed = 0
+        
+        self._write({
+            "event": "start",
+            "num_images": num_images,
+            "index_offset": index_offset,
+            "time": time.time()
+        }, flush=True)
+    
+    def record_saved(self, url, file_path):
+        """저장한 이미지 기록"""
+        self._write({"event": "saved", "url": url, "file": os.path.basename(file_path)})
+    
+    def record_duplicate(self, url, file_path):
+        """중복으로 건너뛴 이미지 기록"""
+        self._write({"event": "duplicate", "url": url, "file": os.path.basename(file_path)})
+    
+    def record_failed(self, url, error=""):
+        """다운로드에 실패한 이미지 기록"""
+        self._write({"event": "failed", "url": url, "error": error})
+    
+    def record_page(self, page_start, consecutive_failures):
+        """
+        페이지 처리 완료 기록
+        
+        Args:
+            page_start (int): 다음에 로드할 페이지 위치
+            consecutive_failures (int): 연속으로 URL을 찾지 못한 페이지 수
+        """
+        self._write({
+            "event": "page",
+            "page_start": page_start,
+            "consecutive_failures": consecutive_failures
+        }, flush=True)
+    
+    def complete(self):
+        """목표 개수 달성 기록"""
+        self._write({"event": "done", "time": time.time()}, flush=True)
+    
+    def flush(self):
+        """기록 대기 중인 이벤트를 파일에 반영"""
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                self._unflushed = 0
+    
+    def close(self):
+        """저널 파일 닫기"""
+        with self._lock:
+            if self._file is not None and not self._file.closed:
+                self._file.close()
@@ -1,57 +1,231 @@
+import hashlib
+import itertools
 import os
+import queue
+import re
+import threading
 import time
-import requests
 from pathlib import Path
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from bs4 import BeautifulSoup
 from urllib.parse import urlparse
+from collections import namedtuple
+from downloader import DownloadEngine, DownloadCancelledError, END_OF_URLS, QUEUE_POLL_INTERVAL
+from http_client import HttpClient, USER_AGENT, iter_available
+from image_extractor import IMAGE_SELECTORS, EXTRACT_IMAGE_URLS_JS, extract_image_urls
+from page_wait import wait_until_settled
+from download_chromedriver import resolve_driver_path
+from dedup import UrlIndex, ContentHashStore
+from perceptual import PerceptualIndex
+from checkpoint import CrawlCheckpoint
+from sinks import FileSink
+from manifest import Manifest
+from transform import format_stats
+from rate_limiter import HostRateLimiter
+from retry_policy import RetryPolicy, CircuitBreaker, DeadlineExceededError
+from image_info import (
+    HEADER_BYTES, SNIFF_BYTES, image_format, image_size, is_image_content_type
+)
+
+
+# 다운로드 결과 레코드 (status는 HTTP 상태 코드, latency는 초 단위, sha256은 본문 해시,
+# perceptual_hash는 유사 이미지 검출을 켠 경우의 지각 해시, data는 메모리 저장 시 이미지 데이터,
+# width/height는 헤더에서 읽은 이미지 크기, first_byte는 첫 바이트를 받기까지 걸린 시간,
+# format은 매직 바이트로 판별한 이미지 형식)
+ImageResult = namedtuple(
+    "ImageResult",
+    ["url", "path", "bytes", "latency", "status", "sha256", "perceptual_hash", "data",
+     "content_type", "width", "height", "first_byte", "format"],
+    defaults=(None, None, None, None, None, None, None, None)
+)
+
+
+# 페이지 처리 완료 표시 (URL 큐에 넣어 앞선 URL이 모두 저장된 뒤 체크포인트에 기록)
+PageMarker = namedtuple("PageMarker", ["page_start", "consecutive_failures"])
+
+
+class ImageTooLargeError(Exception):
+    """이미지 크기가 허용 한도를 넘은 경우"""
+
+
+class InvalidImageError(Exception):
+    """응답이 이미지가 아닌 경우 (HTML 오류 페이지 등)"""
+
+
+class HostBlockedError(DownloadCancelledError):
+    """회로 차단기가 열려 있어 요청하지 않은 경우 (실패로 기록하지 않고 나중에 다시 시도)"""
+
+
+class ImageDeadlineError(DeadlineExceededError):
+    """이미지 한 개의 다운로드가 제한 시간(image_deadline)을 넘은 경우"""
+
+
+
+def create_driver(headless=False):
+    """
+    크롬 드라이버 생성
+    
+    Args:
+        headless (bool): 브라우저 헤드리스 모드 여부
+    
+    Returns:
+        WebDriver: 셀레니움 크롬 드라이버
+    """
+    chrome_options = Options()
+    
+    # 헤드리스 모드 설정
+    if headless:
+        chrome_options.add_argument("--headless=new")
+    
+    # 기본 옵션
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    
+    # User-Agent 설정
+    chrome_options.add_argument(f"user-agent={USER_AGENT}")
+    
+    # ChromeDriver 경로 확인 (프로세스당 한 번, Chrome 버전이 바뀌면 자동 재설치) 및 실행
+    service = Service(resolve_driver_path())
+    return webdriver.Chrome(service=service, options=chrome_options)
 
 
 class GoogleImageCrawler:
     """Google 이미지 크롤러 클래스"""
     
-    def __init__(self, headless=False):
+    def __init__(self, headless=False, max_workers=8, per_host_limit=4, http_client=None,
+                 max_image_bytes=20 * 1024 * 1024, chunk_size=64 * 1024, extraction_backend="script",
+                 page_timeout=10, settle_time=0.5, driver=None, download_budget=None,
+                 url_index=None, url_dedup="keyword", content_dedup="skip",
+                 near_dup_threshold=None, near_dup_hash="dhash", url_queue_size=100,
+                 sink=None, transform=None, rate_limiter=None, retry_policy=None,
+                 circuit_breaker=None, connect_timeout=5.0, read_timeout=10.0,
+                 image_deadline=30.0, grace_period=5.0, host_limiter=None):
         """
         크롤러 초기화
         
         Args:
             headless (bool): 브라우저 헤드리스 모드 여부 (기본값: False)
+            max_workers (int): 동시에 다운로드할 이미지 수 (기본값: 8)
+            per_host_limit (int): 호스트별 최대 동시 다운로드 수 (기본값: 4)
+            http_client (HttpClient): 여러 크롤러가 공유할 HTTP 클라이언트
+                (None이면 크롤러 전용 클라이언트 생성)
+            max_image_bytes (int): 이미지 최대 크기, 초과 시 다운로드 중단 (기본값: 20MB)
+            chunk_size (int): 스트리밍 다운로드 청크 크기 (기본값: 64KB)
+            extraction_backend (str): 이미지 URL 추출 방식
+                ("script": 브라우저에서 스크립트 실행, "html": page_source를 BeautifulSoup으로 파싱)
+            page_timeout (float): 페이지 로드/스크롤 후 최대 대기 시간 (기본값: 10초)
+            settle_time (float): 섬네일 수와 스크롤 높이가 이 시간 동안 변하지 않으면
+                로드가 끝난 것으로 판단 (기본값: 0.5초)
+            driver (WebDriver): 재사용할 기존 드라이버 (드라이버 풀 등에서 전달하며,
+                close()에서 종료하지 않음)
+            download_budget (DownloadBudget): 여러 크롤러가 공유하는 전역 동시 다운로드 한도
+            url_index (UrlIndex): 이미 받은 URL 인덱스 (None이면 저장 디렉토리의
+                .url_index.log를 사용)
+            url_dedup (str): 중복 URL 판단 범위
+                ("keyword": 같은 키워드에서 받은 URL 제외, "global": 모든 키워드 기준, None: 사용 안 함)
+            content_dedup (str): 내용이 같은 이미지 처리 방식
+                ("skip": 저장하지 않음, "hardlink": duplicates 폴더에 하드링크, None: 사용 안 함)
+            near_dup_threshold (int): 유사 이미지로 볼 지각 해시 최대 해밍 거리
+                (None이면 사용 안 함, 6 정도 권장, content_dedup 방식으로 처리)
+            near_dup_hash (str): 지각 해시 종류 ("ahash", "dhash", "phash")
+            url_queue_size (int): 페이지 로드 단계와 다운로드 단계 사이 URL 큐 크기
+                (가득 차면 다음 페이지 로드를 멈추고 기다림)
+            sink (FileSink | MemorySink | ShardSink): 이미지 저장 대상 (None이면 파일로 저장,
+                MemorySink를 주면 디스크에 쓰지 않고 ImageResult.data로 memoryview 반환,
+                ShardSink를 주면 크기 제한이 있는 tar 샤드에 순서대로 추가)
+            transform (ThumbnailTransform): 저장한 이미지를 섬네일로 변환할 단계 (선택,
+                키워드 폴더의 thumbnails/에 저장, 프로세스 풀에서 실행되며 닫기는 호출한 쪽에서 처리,
+                ShardSink에는 적용되지 않음)
+            rate_limiter (HostRateLimiter): 호스트별 요청 속도 제한 (일괄 검색 시 키워드 간 공유,
+                None이면 크롤러 전용 제한 생성)
+            retry_policy (RetryPolicy): 일시적 오류 재시도 정책 (None이면 최대 3회, 지수 백오프)
+            circuit_breaker (CircuitBreaker): 호스트별 회로 차단기 (일괄 검색 시 키워드 간 공유,
+                None이면 크롤러 전용 차단기 생성)
+            connect_timeout (float): 이미지 서버 연결 타임아웃 (기본값: 5초)
+            read_timeout (float): 응답 데이터 사이 최대 대기 시간 (기본값: 10초)
+            image_deadline (float): 이미지 한 개(요청 한 번)의 전체 다운로드 제한 시간
+                (조금씩 흘려보내는 느린 응답도 이 시간을 넘으면 중단, None이면 제한 없음)
+            grace_period (float): 작업 시간 제한(time_limit)에 도달한 뒤 진행 중인
+                다운로드를 기다려 줄 시간 (기본값: 5초, 이후 남은 다운로드는 취소)
+            host_limiter (HostLimiter): 호스트별 동시 다운로드 제한 (일괄 검색 시 키워드 간 공유,
+                None이면 per_host_limit로 크롤러 전용 제한 생성)
         """
-        self.driver = None
+        self.driver = driver
         self.headless = headless
-        self.setup_driver()
+        self.pages_loaded = 0
+        self.max_image_bytes = max_image_bytes
+        self.chunk_size = chunk_size
+        self.extraction_backend = extraction_backend
+        self.page_timeout = page_timeout
+        self.settle_time = settle_time
+        
+        # 마지막 페이지의 단계별 실제 대기 시간 (초)
+        self.settle_times = {}
+        
+        # 이미 받은 URL 인덱스 (직접 연 인덱스는 close()에서 닫음)
+        self.url_index = url_index
+        self.url_dedup = url_dedup
+        self._url_indexes = {}
+        
+        # 저장 경로별 콘텐츠 해시 저장소
+        self.content_dedup = content_dedup
+        self._hash_stores = {}
+        
+        # 저장 경로별 지각 해시 인덱스 (유사 이미지 검출)
+        self.near_dup_threshold = near_dup_threshold
+        self.near_dup_hash = near_dup_hash
+        self._near_indexes = {}
+        
+        self.url_queue_size = url_queue_size
+        self.sink = sink or FileSink()
+        self.transform = transform
+        
+        # 호스트별 요청 속도 제한 (고정 지연 대신 호스트마다 토큰 버킷으로 조절)
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        
+        # 일시적 오류 재시도 및 장애 호스트 차단
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        
+        # 이미지별/작업별 시간 제한
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.image_deadline = image_deadline
+        self.grace_period = grace_period
+        
+        # 연결 풀 공유 (일괄 검색 시 키워드 간에도 연결 재사용)
+        self._owns_http = http_client is None
+        self.http = http_client or HttpClient(pool_size=max_workers)
+        self.downloader = DownloadEngine(
+            self,
+            max_workers=max_workers,
+            per_host_limit=per_host_limit,
+            budget=download_budget,
+            host_limiter=host_limiter
+        )
+        
+        self._owns_driver = driver is None
+        if self._owns_driver:
+            self.setup_driver()
     
     def setup_driver(self):
         """크롬 드라이버 설정"""
-        chrome_options = Options()
-        
-        # 헤드리스 모드 설정
-        if self.headless:
-            chrome_options.add_argument("--headless=new")
-        
-        # 기본 옵션
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        
-        # User-Agent 설정
-        chrome_options.add_argument(
-            "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-            "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        )
+        self.driver = create_driver(self.headless)
+    
+    def open_url(self, url):
+        """
+        드라이버로 페이지 이동 (로드한 페이지 수 집계)
         
-        # ChromeDriver 자동 설치 및 실행
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
+        Args:
+            url (str): 이동할 URL
+        """
+        self.driver.get(url)
+        self.pages_loaded += 1
     
     def get_search_url(self, keyword, start=0):
         """
@@ -68,18 +242,83 @@ class GoogleImageCrawler:
         # start는 이미지 오프셋(예: 0, 20, 40...)으로 동작합니다.
         return f"https://www.google.com/search?tbm=isch&q={keyword}&start={start}"
     
-    def scroll_and_load_images(self, num_scrolls=10):
+    def wait_for_page(self, wait_for_images=False, deadline=None, stop_event=None):
+        """
+        섬네일 수와 스크롤 높이가 안정될 때까지 대기 (최대 page_timeout초)
+        
+        Args:
+            wait_for_images (bool): 먼저 이미지 요소가 나타날 때까지 대기할지 여부
+            deadline (float): 작업 제한 시각 (time.monotonic() 기준, 남은 시간만큼만 대기)
+            stop_event (threading.Event): 설정되면 대기 중단
+        
+        Returns:
+            float: 실제 대기 시간 (초)
+        """
+        timeout = self.page_timeout
+        if deadline is not None:
+            timeout = max(min(timeout, deadline - time.monotonic()), 0)
+        return wait_until_settled(
+            self.driver,
+            timeout=timeout,
+            settle_time=self.settle_time,
+            wait_for_images=wait_for_images,
+            stop_event=stop_event
+        )
+    
+    def wait_for_page_load(self, deadline=None, stop_event=None):
+        """
+        검색 페이지 로드 대기
+        
+        Args:
+            deadline (float): 작업 제한 시각 (time.monotonic() 기준, 남은 시간만큼만 대기)
+            stop_event (threading.Event): 설정되면 대기 중단
+        
+        Returns:
+            float: 실제 대기 시간 (초)
+        """
+        elapsed = self.wait_for_page(wait_for_images=True, deadline=deadline, stop_event=stop_event)
+        self.settle_times["load"] = elapsed
+        return elapsed
+    
+    def scroll_and_load_images(self, num_scrolls=10, target_count=None, url_filter=None,
+                               deadline=None, stop_event=None):
         """
         페이지 스크롤하여 이미지 로드
         
+        스크롤할 때마다 고유 후보 URL 수를 확인하여, target_count개 이상
+        모였거나 스크롤해도 새 URL이 늘지 않으면 남은 스크롤을 건너뜁니다.
+        
         Args:
-            num_scrolls (int): 스크롤 횟수
+            num_scrolls (int): 최대 스크롤 횟수
+            target_count (int): 필요한 후보 URL 수 (None이면 개수 제한 없음)
+            url_filter (callable): 후보로 셀 URL만 True를 반환하는 함수 (선택)
+            deadline (float): 작업 제한 시각 (time.monotonic() 기준, 지나면 스크롤 중단)
+            stop_event (threading.Event): 설정되면 스크롤 중단
+        
+        Returns:
+            list: 마지막으로 확인한 이미지 URL 리스트 (url_filter 적용)
         """
+        def collect_urls():
+            urls = self.get_image_urls()
+            if url_filter is None:
+                return urls
+            return [url for url in urls if url_filter(url)]
+        
+        total_wait = 0.0
+        image_urls = collect_urls()
+        
         # Google 이미지는 스크롤로 더 많은 섬네일을 로드합니다.
         for i in range(num_scrolls):
-            # 페이지 끝까지 스크롤
+            if target_count is not None and len(image_urls) >= target_count:
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            if stop_event is not None and stop_event.is_set():
+                break
+            
+            # 페이지 끝까지 스크롤 후 새 섬네일 로드가 멈출 때까지 대기
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(1.0)
+            total_wait += self.wait_for_page(deadline=deadline, stop_event=stop_event)
 
             # 가끔 'Show more results' 버튼이 존재할 수 있으므로 클릭 시도
             try:
@@ -87,34 +326,57 @@ class GoogleImageCrawler:
                 if more_btns:
                     try:
                         self.driver.execute_script("arguments[0].click();", more_btns[0])
-                        time.sleep(1.0)
+                        total_wait += self.wait_for_page(deadline=deadline, stop_event=stop_event)
                     except Exception:
                         pass
             except Exception:
                 pass
             
-            time.sleep(0.5)
+            # 스크롤해도 새 URL이 없으면 더 내려도 소용없음
+            previous_count = len(image_urls)
+            image_urls = collect_urls()
+            if len(image_urls) <= previous_count:
+                break
+        
+        self.settle_times["scroll"] = total_wait
+        return image_urls
     
     def get_image_urls(self):
         """
         현재 페이지에서 이미지 URL 추출
         
+        모든 후보 속성(src, data-src, data-iurl, data-srcset)과 상위 링크의
+        imgurl= 값을 한 번의 WebDriver 호출로 수집합니다. extraction_backend가
+        "html"이면 page_source를 한 번 받아 브라우저 밖에서 파싱합니다.
+        
+        Returns:
+            list: 이미지 URL 리스트
+        """
+        try:
+            if self.extraction_backend == "html":
+                return extract_image_urls(self.driver.page_source)
+            
+            return self.driver.execute_script(EXTRACT_IMAGE_URLS_JS, IMAGE_SELECTORS) or []
+        
+        except Exception as e:
+            print(f"이미지 요소 찾기 실패: {e}")
+            return []
+    
+    def get_image_urls_legacy(self):
+        """
+        현재 페이지에서 이미지 URL 추출 (요소별 WebDriver 호출 방식)
+        
+        요소마다 get_attribute를 여러 번 호출하므로 느립니다.
+        get_image_urls와 결과 및 속도를 비교하는 용도로 남겨둡니다.
+        
         Returns:
             list: 이미지 URL 리스트
         """
         image_urls = []
         
         try:
-            # Google 이미지에서 사용되는 대표적인 섬네일 선택자
-            selectors = [
-                "img.rg_i",
-                "img.Q4LuWd",
-                "div.isv-r img",
-                "img"
-            ]
-            
             images = []
-            for selector in selectors:
+            for selector in IMAGE_SELECTORS:
                 try:
                     images.extend(self.driver.find_elements(By.CSS_SELECTOR, selector))
                 except:
@@ -156,105 +418,630 @@ class GoogleImageCrawler:
         
         return image_urls
     
-    def download_image(self, image_url, save_path, filename):
+    def load_page(self, keyword, page_start=0, target_count=None, url_filter=None, deadline=None,
+                  stop_event=None):
+        """
+        검색 결과 페이지를 열고 이미지 URL 추출
+        
+        deadline이 있으면 로드/스크롤 대기를 남은 시간으로 줄입니다. 페이지 이동
+        자체(driver.get)는 중단할 수 없으므로 그만큼은 제한 시각을 넘을 수 있습니다.
+        
+        Args:
+            keyword (str): 검색 키워드
+            page_start (int): 시작 이미지 번호
+            target_count (int): 필요한 이미지 URL 수 (모이면 스크롤 중단)
+            url_filter (callable): 받을 URL만 True를 반환하는 함수 (선택)
+            deadline (float): 작업 제한 시각 (time.monotonic() 기준)
+            stop_event (threading.Event): 설정되면 남은 로드/스크롤 대기를 건너뜀
+        
+        Returns:
+            list: 이미지 URL 리스트
+        """
+        # 검색 URL로 이동
+        search_url = self.get_search_url(keyword, page_start)
+        print(f"\n페이지 로드 중: {search_url}")
+        self.open_url(search_url)
+        
+        # 페이지 로드 대기 (섬네일이 더 늘지 않으면 바로 진행)
+        self.wait_for_page_load(deadline, stop_event)
+        
+        # 필요한 만큼만 스크롤하며 이미지 URL 추출
+        image_urls = self.scroll_and_load_images(
+            num_scrolls=5,
+            target_count=target_count,
+            url_filter=url_filter,
+            deadline=deadline,
+            stop_event=stop_event
+        )
+        print(f"현재 페이지에서 {len(image_urls)}개의 이미지 URL 추출됨")
+        print(
+            f"페이지 안정화 시간: 로드 {self.settle_times['load']:.1f}초, "
+            f"스크롤 {self.settle_times['scroll']:.1f}초"
+        )
+        
+        return image_urls
+    
+    def download_image(self, image_url, save_path, filename, cancel_event=None, deadline=None,
+                       raise_errors=False):
         """
         이미지 다운로드
         
+        요청마다 호스트의 속도 제한 차례를 기다립니다. 연결 오류, 타임아웃,
+        5xx, 429 같은 일시적 오류는 retry_policy에 따라 지터를 준 지수 백오프로
+        다시 요청하고, 404나 이미지가 아닌 응답은 바로 실패로 처리합니다.
+        호스트 장애는 회로 차단기에 기록하여, 회로가 열린 호스트에는 요청하지 않습니다.
+        
         Args:
             image_url (str): 이미지 URL
             save_path (str): 저장 경로
             filename (str): 파일명
+            cancel_event (threading.Event): 설정되면 진행 중인 다운로드와 속도 제한/재시도 대기를 중단
+            deadline (float): 작업 제한 시각 (time.monotonic() 기준, 속도 제한 차례가
+                이 시각 뒤라면 요청하지 않음)
+            raise_errors (bool): True면 실패 시 None 대신 마지막 오류를 그대로 발생
+                (호출한 쪽에서 실패 원인을 기록할 때 사용)
         
         Returns:
-            bool: 다운로드 성공 여부
+            ImageResult: 다운로드 결과 (실패 시 None)
+        
+        Raises:
+            DownloadCancelledError: 취소되었거나 제한 시각 전에 요청 차례가 오지 않은 경우
+            HostBlockedError: raise_errors=True이고 회로가 열린 호스트인 경우
+            Exception: raise_errors=True일 때 마지막 다운로드 오류
         """
-        try:
-            # 이미지 다운로드 (타임아웃 설정)
-            response = requests.get(image_url, timeout=10, allow_redirects=True)
+        for attempt in range(self.retry_policy.max_retries + 1):
+            if cancel_event is not None and cancel_event.is_set():
+                raise DownloadCancelledError("다운로드 취소")
+            if not self.circuit_breaker.allow(image_url):
+                if raise_errors:
+                    raise HostBlockedError("호스트 차단 중")
+                print(f"이미지 다운로드 건너뜀 ({image_url}): 호스트 차단 중")
+                return None
+            
+            # 호스트 상태를 판정하지 못하고 끝나면(취소 등) 시험 요청 차례를 반납
+            settled = False
+            try:
+                if not self.rate_limiter.acquire(image_url, cancel_event, deadline):
+                    raise DownloadCancelledError("작업 제한 시간 전에 요청 차례가 오지 않음")
+                result = self.fetch_image(image_url, os.path.join(save_path, filename), cancel_event)
+            
+            except DownloadCancelledError:
+                raise
+            
+            except Exception as e:
+                if self.retry_policy.is_host_failure(e):
+                    self.circuit_breaker.record_failure(image_url)
+                else:
+                    # 호스트는 응답함 (404, 이미지가 아닌 응답, 429 등)
+                    self.circuit_breaker.record_success(image_url)
+                settled = True
+                
+                if not self.retry_policy.is_retryable(e) or attempt == self.retry_policy.max_retries:
+                    if raise_errors:
+                        raise
+                    print(f"이미지 다운로드 실패 ({image_url}): {e}")
+                    return None
+                
+                delay = self.retry_policy.backoff(attempt)
+                if cancel_event is not None:
+                    cancel_event.wait(delay)
+                else:
+                    time.sleep(delay)
+                continue
+            
+            else:
+                self.circuit_breaker.record_success(image_url)
+                settled = True
+                return result
+            
+            finally:
+                if not settled:
+                    self.circuit_breaker.release(image_url)
+    
+    def fetch_image(self, image_url, file_path, cancel_event=None):
+        """
+        이미지를 스트리밍으로 받아 저장 대상(sink)에 저장
+        
+        응답 본문을 청크 단위로 저장 대상에 기록하며, 실패하면 저장 대상이
+        불완전한 데이터를 지웁니다 (FileSink: 임시 파일 후 원자적 이름 변경,
+        MemorySink: 메모리 버퍼). 받는 동안 청크마다 SHA-256 해시를 갱신하고
+        앞부분 헤더에서 이미지 크기를 읽으므로 저장한 데이터를 다시 읽지 않습니다.
+        
+        저장 대상에 쓰기 전에 Content-Type 헤더와 첫 청크의 매직 바이트를 확인하여
+        이미지가 아닌 응답은 나머지 본문을 받지 않고 중단합니다.
+        
+        연결과 데이터 사이 대기는 connect_timeout/read_timeout으로 제한하고, 본문은
+        도착한 만큼씩 읽으면서 읽을 때마다 전체 경과 시간을 확인하여 image_deadline을
+        넘은 느린 응답은 중단합니다 (최악의 경우 image_deadline + read_timeout 안에 끝남).
+        
+        Args:
+            image_url (str): 이미지 URL
+            file_path (str): 저장할 파일 경로 (메모리 저장 시 버퍼 이름)
+            cancel_event (threading.Event): 설정되면 다음 읽기에서 다운로드 중단
+        
+        Returns:
+            ImageResult: 다운로드 결과 (바이트 수, 응답 시간, 본문 해시, 이미지 형식과 크기 포함)
+        
+        Raises:
+            ImageTooLargeError: 이미지가 max_image_bytes보다 큰 경우
+            InvalidImageError: 응답이 이미지가 아닌 경우
+            ImageDeadlineError: 다운로드가 image_deadline보다 오래 걸린 경우
+            DownloadCancelledError: cancel_event가 설정된 경우
+        """
+        started = time.perf_counter()
+        deadline = started + self.image_deadline if self.image_deadline is not None else None
+        
+        def check_progress():
+            if cancel_event is not None and cancel_event.is_set():
+                raise DownloadCancelledError("다운로드 취소")
+            if deadline is not None and time.perf_counter() > deadline:
+                raise ImageDeadlineError(f"다운로드 제한 시간 초과: {self.image_deadline}초")
+        
+        # 이미지 다운로드 (연결 풀 재사용, 연결/읽기 타임아웃 분리)
+        with self.http.get(image_url, timeout=(self.connect_timeout, self.read_timeout),
+                           allow_redirects=True, stream=True) as response:
+            # 429/503이면 호스트 감속, 성공이면 회복
+            self.rate_limiter.observe(
+                image_url, response.status_code, response.headers.get("Retry-After")
+            )
             response.raise_for_status()
             
-            # 파일 저장
-            file_path = os.path.join(save_path, filename)
-            with open(file_path, 'wb') as f:
-                f.write(response.content)
+            content_type = response.headers.get("Content-Type")
+            if not is_image_content_type(content_type):
+                raise InvalidImageError(f"이미지가 아닌 응답: {content_type}")
+            
+            # Content-Length로 너무 큰 이미지는 본문을 받기 전에 중단
+            content_length = response.headers.get("Content-Length", "")
+            size_hint = int(content_length) if content_length.isdigit() else None
+            if size_hint is not None and size_hint > self.max_image_bytes:
+                raise ImageTooLargeError(
+                    f"이미지 크기 초과: {size_hint} > {self.max_image_bytes} bytes"
+                )
+            
+            # 형식을 판별할 만큼 앞부분을 먼저 받아 확인 (실패하면 나머지는 받지 않음)
+            # chunk_size가 찰 때까지 기다리지 않고 받은 만큼씩 처리 (느린 응답도 제한 시간 확인)
+            chunks = iter_available(response, self.chunk_size)
+            first_chunks = []
+            first_bytes = b""
+            first_byte = None
+            for chunk in chunks:
+                if first_byte is None:
+                    first_byte = time.perf_counter() - started
+                check_progress()
+                first_chunks.append(chunk)
+                first_bytes += chunk[:SNIFF_BYTES]
+                if len(first_bytes) >= SNIFF_BYTES:
+                    break
+            
+            kind = image_format(first_bytes)
+            if kind is None:
+                raise InvalidImageError(
+                    f"이미지가 아닌 응답: {content_type or '형식 알 수 없음'} ({first_bytes[:8]!r})"
+                )
             
-            return True
+            total_bytes = 0
+            sha256 = hashlib.sha256()
+            header = bytearray()
+            with self.sink.open(file_path, size_hint) as f:
+                for chunk in itertools.chain(first_chunks, chunks):
+                    check_progress()
+                    if len(header) < HEADER_BYTES:
+                        header += chunk[:HEADER_BYTES - len(header)]
+                    total_bytes += len(chunk)
+                    if total_bytes > self.max_image_bytes:
+                        raise ImageTooLargeError(
+                            f"이미지 크기 초과: {self.max_image_bytes} bytes 이상"
+                        )
+                    sha256.update(chunk)
+                    f.write(chunk)
         
-        except Exception as e:
-            print(f"이미지 다운로드 실패 ({image_url}): {e}")
-            return False
+        width, height = image_size(header) or (None, None)
+        
+        return ImageResult(
+            image_url,
+            file_path,
+            total_bytes,
+            time.perf_counter() - started,
+            response.status_code,
+            sha256.hexdigest(),
+            content_type=content_type,
+            width=width,
+            height=height,
+            first_byte=first_byte,
+            format=kind
+        )
     
-    def crawl_images(self, keyword, num_images=50, save_dir="downloads"):
+    def get_url_index(self, save_dir):
         """
-        이미지 크롤링 실행
+        저장 디렉토리의 URL 인덱스 반환 (url_dedup이 None이면 None)
+        
+        Args:
+            save_dir (str): 저장 디렉토리
+        
+        Returns:
+            UrlIndex: 이미 받은 URL 인덱스
+        """
+        if self.url_dedup is None:
+            return None
+        if self.url_index is not None:
+            return self.url_index
+        
+        index_path = os.path.abspath(os.path.join(save_dir, ".url_index.log"))
+        if index_path not in self._url_indexes:
+            self._url_indexes[index_path] = UrlIndex(index_path)
+        return self._url_indexes[index_path]
+    
+    def get_hash_store(self, save_path):
+        """
+        저장 경로의 콘텐츠 해시 저장소 반환 (content_dedup이 None이면 None)
+        
+        Args:
+            save_path (str): 이미지 저장 경로
+        
+        Returns:
+            ContentHashStore: 콘텐츠 해시 저장소
+        """
+        if self.content_dedup is None:
+            return None
+        
+        store_path = os.path.abspath(save_path)
+        if store_path not in self._hash_stores:
+            self._hash_stores[store_path] = ContentHashStore(store_path)
+        return self._hash_stores[store_path]
+    
+    def get_near_index(self, save_path):
+        """
+        저장 경로의 지각 해시 인덱스 반환 (near_dup_threshold가 None이면 None)
+        
+        Args:
+            save_path (str): 이미지 저장 경로
+        
+        Returns:
+            PerceptualIndex: 지각 해시 인덱스
+        """
+        if self.near_dup_threshold is None:
+            return None
+        
+        index_path = os.path.abspath(save_path)
+        if index_path not in self._near_indexes:
+            self._near_indexes[index_path] = PerceptualIndex(
+                index_path,
+                hash_kind=self.near_dup_hash,
+                threshold=self.near_dup_threshold
+            )
+        return self._near_indexes[index_path]
+    
+    @staticmethod
+    def get_last_file_index(save_path, keyword, names=None):
+        """
+        저장 경로에 있는 {keyword}_{n} 파일 중 가장 큰 번호 확인
+        
+        Args:
+            save_path (str): 저장 경로
+            keyword (str): 검색 키워드
+            names (list): 확인할 이미지 이름 목록 (None이면 저장 경로의 파일명)
+        
+        Returns:
+            int: 가장 큰 파일 번호 (파일이 없으면 0)
+        """
+        pattern = re.compile(rf"^{re.escape(keyword)}_(\d+)\.\w+$")
+        last_index = 0
+        
+        if names is None:
+            names = [entry.name for entry in os.scandir(save_path)]
+        
+        for name in names:
+            match = pattern.match(name)
+            if match:
+                last_index = max(last_index, int(match.group(1)))
+        
+        return last_index
+    
+    def iter_images(self, keyword, limit=None, save_dir="downloads", resume=False, time_limit=None,
+                    on_page_loaded=None, cancel_event=None):
+        """
+        이미지를 저장하는 대로 하나씩 반환하는 제너레이터
+        
+        반복하는 만큼만 페이지를 로드하고 다운로드하므로, 중간에 반복을 멈추면
+        (break 또는 close()) 페이지 로드와 남은 다운로드도 함께 멈춥니다.
+        
+        진행 상황은 저장 경로의 .crawl_state.jsonl에 계속 기록되므로, 중단된
+        작업을 resume=True로 다시 실행하면 멈춘 페이지와 파일 번호부터 이어서 받습니다.
+        저장한 이미지의 출처와 응답 정보는 .manifest.jsonl에 기록됩니다 (manifest.py로 조회).
+        
+        time_limit이 지나면 페이지 로드와 새 다운로드를 멈추고, 진행 중인 다운로드를
+        grace_period 동안 기다린 뒤 그때까지 저장한 이미지만으로 끝냅니다. 이 경우
+        작업은 완료로 기록되지 않으므로 resume=True로 나머지를 이어받을 수 있습니다.
+        로드 중인 페이지는 대기를 남은 시간으로 줄이지만 페이지 이동(driver.get)과
+        진행 중인 읽기 한 번(최대 read_timeout)만큼은 제한 시간을 넘을 수 있습니다.
         
         Args:
             keyword (str): 검색 키워드
-            num_images (int): 다운로드할 이미지 개수
+            limit (int): 다운로드할 이미지 개수 (None이면 검색 결과가 끝날 때까지,
+                이어받기 시 이전 실행분 포함)
             save_dir (str): 저장 디렉토리
+            resume (bool): 중단된 작업이 있으면 이어서 실행할지 여부
+            time_limit (float): 작업 전체 제한 시간 (초, None이면 제한 없음)
+            on_page_loaded (callable): 검색 페이지를 로드할 때마다 (검색 URL, 새 이미지 URL 수)로
+                호출할 함수 (페이지 로드 스레드에서 호출)
+            cancel_event (threading.Event): 설정되면 다음 결과를 기다리는 중에도 페이지 로드와
+                다운로드를 멈추고 반복을 끝냄 (다른 스레드에서 중지할 때 사용)
+        
+        Yields:
+            ImageResult: 저장한 이미지 정보 (url, path, bytes, latency, status, 크기 등)
+                MemorySink를 쓰면 data에 이미지 memoryview가 들어 있으며, 사용이 끝나면
+                crawler.sink.release(result.path)로 반납해야 다음 다운로드가 진행됩니다.
         """
+        num_images = limit
+        deadline = time.monotonic() + time_limit if time_limit is not None else None
+        
         # 저장 경로 생성
         save_path = os.path.join(save_dir, keyword)
         Path(save_path).mkdir(parents=True, exist_ok=True)
         
+        # 이전 실행이 비정상 종료되며 남긴 다운로드 임시 파일(.<uuid>.tmp, .tmp.part) 정리
+        for entry in os.scandir(save_path):
+            if entry.name.startswith(".") and entry.name.endswith((".tmp", ".tmp.part")):
+                os.remove(entry.path)
+        
         print(f"'{keyword}' 이미지 크롤링 시작...")
         print(f"저장 경로: {save_path}")
-        print(f"목표 이미지 개수: {num_images}")
+        print(f"목표 이미지 개수: {num_images if num_images is not None else '제한 없음'}")
+        if time_limit is not None:
+            print(f"제한 시간: {time_limit}초")
         
         downloaded_count = 0
         page_start = 0
         consecutive_failures = 0
         
-        try:
-            while downloaded_count < num_images and consecutive_failures < 3:
-                # 검색 URL로 이동
-                search_url = self.get_search_url(keyword, page_start)
-                print(f"\n페이지 로드 중: {search_url}")
-                self.driver.get(search_url)
-                
-                # 페이지 로드 대기
-                time.sleep(4)
-                
-                # 이미지 로드를 위해 스크롤
-                self.scroll_and_load_images(num_scrolls=5)
-                
-                # 이미지 URL 추출
-                image_urls = self.get_image_urls()
-                print(f"현재 페이지에서 {len(image_urls)}개의 이미지 URL 추출됨")
-                
-                if len(image_urls) == 0:
-                    consecutive_failures += 1
-                    page_start += 30
-                    continue
-                else:
-                    consecutive_failures = 0
-                
-                # 이미지 다운로드
-                for idx, image_url in enumerate(image_urls):
-                    if downloaded_count >= num_images:
+        # 이전 실행에서 받은 URL과 이번 실행에서 시도한 URL은 건너뜀
+        url_index = self.get_url_index(save_dir)
+        dedup_keyword = keyword if self.url_dedup == "keyword" else None
+        attempted_urls = set()
+        
+        def is_new_url(url):
+            if url in attempted_urls:
+                return False
+            return url_index is None or not url_index.contains(url, dedup_keyword)
+        
+        checkpoint = CrawlCheckpoint(save_path)
+        
+        # 큐에 넣은 URL 수와 결과가 나온 URL 수 (차이가 아직 처리 중인 URL 수)
+        queued_urls = 0
+        resolved_urls = 0
+        
+        def on_saved(url, file_path):
+            nonlocal downloaded_count, resolved_urls
+            downloaded_count += 1
+            resolved_urls += 1
+            if url_index is not None:
+                url_index.add(url, keyword)
+            checkpoint.record_saved(url, file_path)
+        
+        def on_duplicate(url, file_path):
+            nonlocal resolved_urls
+            resolved_urls += 1
+            if url_index is not None:
+                url_index.add(url, keyword)
+            checkpoint.record_duplicate(url, file_path)
+        
+        def on_failed(url, error=""):
+            nonlocal resolved_urls
+            resolved_urls += 1
+            checkpoint.record_failed(url, error)
+        
+        def on_deferred(url):
+            nonlocal resolved_urls
+            resolved_urls += 1
+        
+        # 저장한 이미지의 출처 기록 (URL → 찾은 검색 페이지 위치)
+        manifest = Manifest(save_path)
+        url_pages = {}
+        
+        # 내용이 같은 이미지는 개수에 포함하지 않음
+        hash_store = self.get_hash_store(save_path)
+        near_index = self.get_near_index(save_path)
+        
+        # 기존 파일을 덮어쓰지 않도록 마지막 번호 다음부터 저장
+        last_file_index = self.get_last_file_index(save_path, keyword, self.sink.names(save_path))
+        
+        if resume and checkpoint.resumable:
+            # 중단된 작업 상태 복원
+            downloaded_count = checkpoint.downloaded
+            page_start = checkpoint.page_start
+            consecutive_failures = checkpoint.consecutive_failures
+            attempted_urls.update(checkpoint.consumed_urls)
+            
+            # 저널에 기록되기 전에 저장된 파일이 있어도 덮어쓰지 않음
+            index_offset = max(checkpoint.index_offset, last_file_index - downloaded_count)
+            print(
+                f"이전 작업을 이어서 실행합니다: {downloaded_count}개 완료, "
+                f"페이지 {page_start}, 실패 {len(checkpoint.failures)}개"
+            )
+        else:
+            index_offset = last_file_index
+            checkpoint.start(num_images, index_offset)
+            if index_offset:
+                print(f"기존 이미지 {index_offset}번 다음부터 저장합니다.")
+        
+        # 파이프라인: 페이지 로드(생산자 스레드) → URL 큐 → 다운로드 스레드 → 저장(현재 스레드)
+        url_queue = queue.Queue(maxsize=self.url_queue_size)
+        stop_event = threading.Event()
+        
+        def put_url(item):
+            # 큐가 가득 차면 대기 (다운로드가 끝났으면 포기)
+            while not stop_event.is_set():
+                try:
+                    url_queue.put(item, timeout=QUEUE_POLL_INTERVAL)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+        
+        def needed_urls():
+            # 남은 목표 개수 중 큐에 있거나 다운로드 중인 URL로 채워지지 않은 개수
+            if num_images is None:
+                return None
+            return num_images - downloaded_count - (queued_urls - resolved_urls)
+        
+        def produce_urls():
+            nonlocal page_start, consecutive_failures, queued_urls
+            
+            try:
+                while not stop_event.is_set() and consecutive_failures < 3:
+                    if deadline is not None and time.monotonic() >= deadline:
+                        # 제한 시간이 지나면 다음 페이지를 로드하지 않음
                         break
                     
-                    # 파일명 생성
-                    file_extension = self.get_file_extension(image_url)
-                    filename = f"{keyword}_{downloaded_count + 1}{file_extension}"
+                    # 이미 받은 URL로 목표를 채울 수 있으면 결과가 나올 때까지 다음 페이지를 로드하지 않음
+                    target_count = needed_urls()
+                    if target_count is not None and target_count <= 0:
+                        stop_event.wait(QUEUE_POLL_INTERVAL)
+                        continue
+                    
+                    # 검색 페이지 로드 및 새 이미지 URL 추출
+                    image_urls = self.load_page(
+                        keyword,
+                        page_start,
+                        target_count=target_count,
+                        url_filter=is_new_url,
+                        deadline=deadline,
+                        stop_event=stop_event
+                    )
+                    if stop_event.is_set():
+                        return
+                    attempted_urls.update(image_urls)
+                    url_pages.update(dict.fromkeys(image_urls, page_start))
+                    if on_page_loaded is not None:
+                        on_page_loaded(self.get_search_url(keyword, page_start), len(image_urls))
                     
-                    # 이미지 다운로드
-                    if self.download_image(image_url, save_path, filename):
-                        downloaded_count += 1
-                        print(f"[{downloaded_count}/{num_images}] {filename} 다운로드 완료")
+                    consecutive_failures = 0 if image_urls else consecutive_failures + 1
                     
-                    time.sleep(0.3)  # 요청 간 지연
-                
-                # 다음 페이지로 이동
-                page_start += 30
+                    # 다음 페이지로 이동
+                    page_start += 30
+                    
+                    for item in image_urls + [PageMarker(page_start, consecutive_failures)]:
+                        if not put_url(item):
+                            return
+                        if isinstance(item, str):
+                            queued_urls += 1
+            
+            except Exception as e:
+                print(f"페이지 로드 중 오류 발생: {e}")
+            
+            finally:
+                put_url(END_OF_URLS)
         
-        except Exception as e:
-            print(f"크롤링 중 오류 발생: {e}")
+        def on_page(marker):
+            checkpoint.record_page(marker.page_start, marker.consecutive_failures)
+        
+        producer = threading.Thread(target=produce_urls, name="page-producer", daemon=True)
+        
+        downloaded_bytes = 0
+        started = time.perf_counter()
+        
+        # 이미지 동시 다운로드 (완료 순서대로 번호 부여)
+        images = self.downloader.iter_stream(
+            url_queue,
+            save_path,
+            keyword,
+            downloaded_count,
+            num_images,
+            index_offset=index_offset,
+            on_saved=on_saved,
+            hash_store=hash_store,
+            duplicate_mode=self.content_dedup or "skip",
+            near_index=near_index,
+            on_duplicate=on_duplicate,
+            on_failed=on_failed,
+            on_deferred=on_deferred,
+            on_marker=on_page,
+            deadline=deadline,
+            grace_period=self.grace_period,
+            stop_event=cancel_event
+        )
+        
+        try:
+            producer.start()
+            
+            for result in images:
+                manifest.record(result, url_pages.pop(result.url, None))
+                downloaded_bytes += result.bytes
+                if self.transform is not None and (self.sink.on_disk or result.data is not None):
+                    # 디코딩과 축소는 작업 프로세스에서 처리하고 바로 다음 이미지로 진행
+                    self.transform.submit(result.path, result.data)
+                yield result
+            
+            if num_images is not None and downloaded_count >= num_images:
+                checkpoint.complete()
         
         finally:
+            # 남은 다운로드 정리 후 페이지 로드 중단, 생산자 종료 대기
+            images.close()
+            stop_event.set()
+            if producer.is_alive():
+                producer.join()
+            
+            elapsed = time.perf_counter() - started
+            
             print(f"\n크롤링 완료!")
             print(f"총 {downloaded_count}개의 이미지 다운로드됨")
+            if (deadline is not None and time.monotonic() >= deadline
+                    and (num_images is None or downloaded_count < num_images)):
+                print("제한 시간 초과로 일부만 받았습니다 (resume=True로 이어받기 가능)")
             print(f"저장 위치: {os.path.abspath(save_path)}")
+            print(
+                f"네트워크: {downloaded_bytes / 1024 / 1024:.1f}MB, "
+                f"{downloaded_bytes / 1024 / 1024 / elapsed:.2f}MB/s ({elapsed:.1f}초)"
+            )
+            
+            if self.transform is not None:
+                # 남은 변환 완료 대기 후 변환 처리량은 따로 보고
+                self.transform.wait()
+                print(f"변환: {format_stats(self.transform.take_stats())}")
+            
+            requests_made, connections, reuse_ratio = self.http.summary()
+            print(f"HTTP 요청 {requests_made}회, 새 연결 {connections}개 (연결 재사용률 {reuse_ratio:.0%})")
+            
+            throttled, slowed_hosts = self.rate_limiter.summary()
+            if throttled:
+                print(f"속도 제한 응답(429/503) {throttled}회, 감속한 호스트 {slowed_hosts}개")
+            
+            open_hosts, skipped_urls = self.circuit_breaker.summary()
+            if open_hosts or skipped_urls:
+                print(f"차단된 호스트 {open_hosts}개, 차단으로 건너뛴 URL {skipped_urls}개")
+            
+            if url_index is not None:
+                url_index.flush()
+            checkpoint.close()
+            manifest.close()
+    
+    def crawl_images(self, keyword, num_images=50, save_dir="downloads", resume=False,
+                     time_limit=None):
+        """
+        이미지 크롤링 실행
+        
+        Args:
+            keyword (str): 검색 키워드
+            num_images (int): 다운로드할 이미지 개수 (이어받기 시 이전 실행분 포함)
+            save_dir (str): 저장 디렉토리
+            resume (bool): 중단된 작업이 있으면 이어서 실행할지 여부
+            time_limit (float): 작업 전체 제한 시간 (초, 지나면 그때까지 받은 이미지만 저장)
+        
+        Returns:
+            int: 이번 실행에서 다운로드한 이미지 개수
+        """
+        downloaded_count = 0
+        
+        try:
+            for result in self.iter_images(keyword, num_images, save_dir, resume, time_limit):
+                downloaded_count += 1
+                self.sink.release(result.path)
+        
+        except Exception as e:
+            print(f"크롤링 중 오류 발생: {e}")
+        
+        return downloaded_count
     
     @staticmethod
     def get_file_extension(url):
@@ -288,8 +1075,20 @@ class GoogleImageCrawler:
         return '.jpg'  # 기본값
     
     def close(self):
-        """드라이버 종료"""
-        if self.driver:
+        """다운로드 스레드, URL 인덱스, 해시 저장소/인덱스, HTTP 세션 및 드라이버 종료"""
+        self.downloader.close()
+        for url_index in self._url_indexes.values():
+            url_index.close()
+        self._url_indexes.clear()
+        for hash_store in self._hash_stores.values():
+            hash_store.close()
+        self._hash_stores.clear()
+        for near_index in self._near_indexes.values():
+            near_index.close()
+        self._near_indexes.clear()
+        if self._owns_http:
+            self.http.close()
+        if self.driver and self._owns_driver:
             self.driver.quit()
 
 
@@ -0,0 +1,325 @@
+"""
+중복 다운로드 방지
+실행과 키워드를 넘어 이미 받은 이미지 URL을 기록하는 디스크 인덱스와,
+저장 디렉토리별로 같은 내용의 이미지를 찾는 콘텐츠 해시 저장소
+
+사용법 (기존 다운로드 폴더 재색인):
+    python3 dedup.py reindex downloads
+    python3 dedup.py reindex downloads --remove   # 중복 파일 삭제
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import threading
+
+
+# 콘텐츠 해시 대상 이미지 확장자
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp')
+
+
+class UrlIndex:
+    """
+    이미 받은 URL 인덱스 (추가 전용 로그 + 메모리 해시 집합)
+    
+    로그 파일에는 "키워드\\tURL" 형식으로 한 줄씩 추가만 하고, 열 때 한 번
+    읽어 64비트 해시 집합을 만듭니다. URL 문자열 대신 해시만 메모리에 두므로
+    수백만 개 규모에서도 조회가 O(1)이고 메모리 사용량이 작습니다.
+    """
+    
+    def __init__(self, file_path, flush_every=100):
+        """
+        인덱스 열기 (파일이 없으면 새로 생성)
+        
+        Args:
+            file_path (str): 인덱스 로그 파일 경로
+            flush_every (int): 이 개수만큼 추가될 때마다 파일에 기록
+        """
+        self.file_path = file_path
+        self.flush_every = flush_every
+        
+        self._lock = threading.Lock()
+        self._global = set()
+        self._by_keyword = set()
+        self._unflushed = 0
+        
+        self._load()
+        
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(file_path, "a", encoding="utf-8")
+    
+    @staticmethod
+    def _hash(text):
+        """문자열의 64비트 해시"""
+        return int.from_bytes(
+            hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(),
+            "big"
+        )
+    
+    def _load(self):
+        """로그 파일을 한 번 읽어 해시 집합 구성"""
+        if not os.path.exists(self.file_path):
+            return
+        
+        with open(self.file_path, encoding="utf-8") as f:
+            for line in f:
+                keyword, _, url = line.rstrip("\n").partition("\t")
+                if url:
+                    self._global.add(self._hash(url))
+                    self._by_keyword.add(self._hash(f"{keyword}\0{url}"))
+    
+    def contains(self, url, keyword=None):
+        """
+        이미 받은 URL인지 확인
+        
+        Args:
+            url (str): 이미지 URL
+            keyword (str): 키워드 (None이면 모든 키워드 기준으로 확인)
+        
+        Returns:
+            bool: 이미 받은 URL이면 True
+        """
+        if keyword is None:
+            return self._hash(url) in self._global
+        return self._hash(f"{keyword}\0{url}") in self._by_keyword
+    
+    def add(self, url, keyword):
+        """
+        받은 URL 기록
+        
+        Args:
+            url (str): 이미지 URL
+            keyword (str): 키워드
+        """
+        keyword_hash = self._hash(f"{keyword}\0{url}")
+        
+        with self._lock:
+            if keyword_hash in self._by_keyword:
+                return
+            
+            self._by_keyword.add(keyword_hash)
+            self._global.add(self._hash(url))
+            self._file.write(f"{keyword}\t{url}\n")
+            
+            self._unflushed += 1
+            if self._unflushed >= self.flush_every:
+                self._file.flush()
+                self._unflushed = 0
+    
+    def __len__(self):
+        return len(self._by_keyword)
+    
+    def flush(self):
+        """기록 대기 중인 항목을 파일에 저장"""
+        with self._lock:
+            self._file.flush()
+            self._unflushed = 0
+    
+    def close(self):
+        """인덱스 파일 닫기"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+def hash_file(file_path, chunk_size=1024 * 1024):
+    """
+    파일의 SHA-256 해시 계산
+    
+    Args:
+        file_path (str): 파일 경로
+        chunk_size (int): 읽기 단위
+    
+    Returns:
+        str: 16진수 해시
+    """
+    sha256 = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def _natural_key(name):
+    """파일명 정렬 키 (고양이_2 < 고양이_10)"""
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", name)]
+
+
+class ContentHashStore:
+    """
+    저장 디렉토리별 콘텐츠 해시 저장소
+    
+    디렉토리의 .content_hashes.log에 "SHA-256\t파일명"을 한 줄씩 추가합니다.
+    로그가 없는 기존 다운로드 폴더는 처음 열 때 폴더의 이미지를 재색인합니다.
+    """
+    
+    LOG_NAME = ".content_hashes.log"
+    
+    def __init__(self, save_path, auto_reindex=True):
+        """
+        저장소 열기
+        
+        Args:
+            save_path (str): 이미지 저장 경로
+            auto_reindex (bool): 로그가 없을 때 폴더의 이미지를 바로 재색인할지 여부
+        """
+        self.save_path = save_path
+        self.file_path = os.path.join(save_path, self.LOG_NAME)
+        
+        self._lock = threading.Lock()
+        self._hashes = {}
+        
+        if os.path.exists(self.file_path):
+            with open(self.file_path, encoding="utf-8") as f:
+                for line in f:
+                    digest, _, filename = line.rstrip("\n").partition("\t")
+                    if filename:
+                        self._hashes.setdefault(digest, filename)
+            self._file = open(self.file_path, "a", encoding="utf-8")
+        else:
+            self._file = open(self.file_path, "a", encoding="utf-8")
+            if not auto_reindex:
+                return
+            duplicates = self.reindex()
+            if self._hashes:
+                print(f"콘텐츠 해시 재색인: {len(self._hashes)}개 이미지, 중복 {len(duplicates)}개")
+    
+    def get(self, digest):
+        """
+        같은 내용으로 이미 저장된 파일 경로 확인
+        
+        Args:
+            digest (str): SHA-256 해시
+        
+        Returns:
+            str: 기존 파일 경로 (없으면 None)
+        """
+        filename = self._hashes.get(digest)
+        if filename is None:
+            return None
+        return os.path.join(self.save_path, filename)
+    
+    def add(self, digest, file_path):
+        """
+        저장한 파일의 해시 기록
+        
+        Args:
+            digest (str): SHA-256 해시
+            file_path (str): 저장한 파일 경로
+        """
+        filename = os.path.basename(file_path)
+        with self._lock:
+            if digest in self._hashes:
+                return
+            self._hashes[digest] = filename
+            self._file.write(f"{digest}\t{filename}\n")
+            self._file.flush()
+    
+    def reindex(self, remove_duplicates=False):
+        """
+        폴더의 이미지를 모두 해시하여 저장소를 다시 구성
+        
+        파일 번호 순서로 처음 나온 파일을 원본으로 보고, 이후 같은 내용의
+        파일은 중복으로 보고합니다.
+        
+        Args:
+            remove_duplicates (bool): 중복 파일 삭제 여부
+        
+        Returns:
+            dict: {중복 파일명: 원본 파일명}
+        """
+        filenames = sorted(
+            (
+                entry.name for entry in os.scandir(self.save_path)
+                if entry.is_file()
+                and not entry.name.startswith(".")
+                and os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS
+            ),
+            key=_natural_key
+        )
+        
+        hashes = {}
+        duplicates = {}
+        for filename in filenames:
+            file_path = os.path.join(self.save_path, filename)
+            digest = hash_file(file_path)
+            if digest in hashes:
+                duplicates[filename] = hashes[digest]
+                if remove_duplicates:
+                    os.remove(file_path)
+            else:
+                hashes[digest] = filename
+        
+        with self._lock:
+            self._hashes = hashes
+            self._file.close()
+            with open(self.file_path, "w", encoding="utf-8") as f:
+                for digest, filename in hashes.items():
+                    f.write(f"{digest}\t{filename}\n")
+            self._file = open(self.file_path, "a", encoding="utf-8")
+        
+        return duplicates
+    
+    def __len__(self):
+        return len(self._hashes)
+    
+    def close(self):
+        """저장소 파일 닫기"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+def reindex_tree(root_dir, remove_duplicates=False):
+    """
+    다운로드 폴더 전체(키워드 폴더별) 재색인
+    
+    Args:
+        root_dir (str): 다운로드 루트 디렉토리
+        remove_duplicates (bool): 중복 파일 삭제 여부
+    
+    Returns:
+        dict: {키워드 폴더: {중복 파일명: 원본 파일명}}
+    """
+    results = {}
+    for entry in sorted(os.scandir(root_dir), key=lambda e: e.name):
+        if not entry.is_dir() or entry.name.startswith("."):
+            continue
+        
+        store = ContentHashStore(entry.path, auto_reindex=False)
+        try:
+            results[entry.name] = store.reindex(remove_duplicates)
+        finally:
+            store.close()
+    
+    return results
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="다운로드 폴더 중복 이미지 관리")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    reindex_parser = subparsers.add_parser("reindex", help="콘텐츠 해시 재색인 및 중복 확인")
+    reindex_parser.add_argument("root_dir", nargs="?", default="downloads", help="다운로드 루트 디렉토리")
+    reindex_parser.add_argument("--remove", action="store_true", help="중복 파일 삭제")
+    
+    args = parser.parse_args()
+    
+    if args.command == "reindex":
+        results = reindex_tree(args.root_dir, remove_duplicates=args.remove)
+        total = 0
+        for keyword, duplicates in results.items():
+            total += len(duplicates)
+            print(f"{keyword}: 중복 {len(duplicates)}개")
+            for duplicate, original in duplicates.items():
+                action = "삭제" if args.remove else "중복"
+                print(f"  {duplicate} → {original} ({action})")
+        print(f"\n총 {total}개 중복 이미지")
+
+
+if __name__ == "__main__":
+    main()
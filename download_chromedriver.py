@@ -4,15 +4,47 @@ ChromeDriver 자동 다운로드 및 설치 스크립트
 
 import os
 import sys
+import json
 import platform
 import subprocess
 import shutil
+import threading
 from pathlib import Path
 from webdriver_manager.chrome import ChromeDriverManager
 from webdriver_manager.core.driver_cache import DriverCacheManager
 
 
-def get_chrome_version():
+# 사용자별 캐시 디렉토리 이름 (빌드한 앱 이름과 같음)
+APP_NAME = "GoogleImageCrawler"
+
+
+def user_cache_dir():
+    """
+    사용자별 캐시 디렉토리 경로 (앱 번들 안은 읽기 전용일 수 있으므로 사용)
+    
+    Returns:
+        str: macOS는 ~/Library/Caches/<앱 이름>, Windows는 %LOCALAPPDATA%/<앱 이름>/Cache,
+            그 외에는 $XDG_CACHE_HOME(기본 ~/.cache)/<앱 이름>
+    """
+    home = os.path.expanduser("~")
+    if sys.platform == "darwin":
+        return os.path.join(home, "Library", "Caches", APP_NAME)
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.join(home, "AppData", "Local")
+        return os.path.join(base, APP_NAME, "Cache")
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(home, ".cache")
+    return os.path.join(base, APP_NAME)
+
+
+# 확인된 드라이버 경로를 Chrome 버전과 함께 저장하는 캐시 파일
+DRIVER_CACHE_FILE = os.path.join(user_cache_dir(), "chromedriver_cache.json")
+
+# 프로세스 안에서 한 번 확인한 드라이버 경로
+_resolved_driver_path = None
+_resolve_lock = threading.Lock()
+
+
+def get_chrome_version(verbose=True):
     """설치된 Chrome 버전 확인"""
     try:
         if sys.platform == "darwin":  # macOS
@@ -32,14 +64,81 @@ def get_chrome_version():
             ], capture_output=True, text=True)
         
         version_string = result.stdout.strip()
-        print(f"Chrome 버전: {version_string}")
-        return version_string
+        if verbose:
+            print(f"Chrome 버전: {version_string}")
+        return version_string or None
     
     except Exception as e:
-        print(f"Chrome 버전 확인 실패: {e}")
+        if verbose:
+            print(f"Chrome 버전 확인 실패: {e}")
         return None
 
 
+def load_driver_cache():
+    """
+    드라이버 경로 캐시 읽기
+    
+    Returns:
+        dict: {"chrome_version": ..., "driver_path": ...} 또는 None
+    """
+    try:
+        with open(DRIVER_CACHE_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_driver_cache(chrome_version, driver_path):
+    """
+    드라이버 경로를 Chrome 버전과 함께 캐시에 저장
+    
+    Args:
+        chrome_version (str): Chrome 버전 문자열
+        driver_path (str): ChromeDriver 경로
+    """
+    try:
+        os.makedirs(os.path.dirname(DRIVER_CACHE_FILE), exist_ok=True)
+        with open(DRIVER_CACHE_FILE, "w", encoding="utf-8") as f:
+            json.dump({"chrome_version": chrome_version, "driver_path": driver_path}, f)
+    except OSError as e:
+        # 저장하지 못해도 이번 실행은 계속 진행 (다음 실행에서 드라이버를 다시 확인)
+        print(f"경고: 드라이버 캐시 저장 실패 ({DRIVER_CACHE_FILE}): {e}")
+
+
+def resolve_driver_path():
+    """
+    ChromeDriver 경로 확인 (프로세스당 한 번)
+    
+    캐시에 저장된 Chrome 버전이 현재 설치된 버전과 같고 드라이버 파일이
+    남아 있으면 webdriver-manager를 거치지 않고 그 경로를 사용합니다.
+    Chrome 버전이 바뀐 경우에만 webdriver-manager로 다시 설치합니다.
+    
+    Returns:
+        str: ChromeDriver 경로
+    """
+    global _resolved_driver_path
+    
+    with _resolve_lock:
+        if _resolved_driver_path is not None:
+            return _resolved_driver_path
+        
+        chrome_version = get_chrome_version(verbose=False)
+        cache = load_driver_cache() or {}
+        cached_path = cache.get("driver_path")
+        
+        # 버전을 확인할 수 없으면 캐시된 드라이버를 그대로 사용
+        version_matches = chrome_version is None or cache.get("chrome_version") == chrome_version
+        
+        if cached_path and version_matches and os.path.exists(cached_path):
+            driver_path = cached_path
+        else:
+            driver_path = ChromeDriverManager().install()
+            save_driver_cache(chrome_version, driver_path)
+        
+        _resolved_driver_path = driver_path
+        return driver_path
+
+
 def download_chromedriver():
     """ChromeDriver 다운로드"""
     print("\n=== ChromeDriver 다운로드 시작 ===")
@@ -66,6 +165,9 @@ def download_chromedriver():
         
         print(f"프로젝트 폴더에도 복사: {local_driver_path}")
         
+        # 크롤러가 webdriver-manager 없이 바로 사용하도록 캐시에 기록
+        save_driver_cache(chrome_version, local_driver_path)
+        
         return driver_path
     
     except Exception as e:
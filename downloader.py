@@ -0,0 +1,440 @@
+"""
+동시 이미지 다운로드 엔진
+스레드 풀로 여러 이미지를 동시에 받고, 완료 순서와 관계없이 파일 번호를 순서대로 부여합니다.
+"""
+
+import hashlib
+import math
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+from image_info import FORMAT_EXTENSIONS
+
+
+# URL 큐 종료 표시
+END_OF_URLS = object()
+
+# URL 큐와 진행 중인 작업을 확인하는 간격 (초)
+QUEUE_POLL_INTERVAL = 0.2
+
+
+class DownloadCancelledError(Exception):
+    """작업 시간 제한 등으로 진행 중인 다운로드를 취소한 경우"""
+
+
+class HostLimiter:
+    """호스트별 동시 다운로드 수 제한"""
+    
+    def __init__(self, per_host_limit=4):
+        """
+        Args:
+            per_host_limit (int): 한 호스트에 동시에 보낼 수 있는 최대 요청 수
+        """
+        self.per_host_limit = per_host_limit
+        self._lock = threading.Lock()
+        self._semaphores = {}
+    
+    @contextmanager
+    def slot(self, url):
+        """
+        URL의 호스트에 대한 다운로드 슬롯 확보
+        
+        Args:
+            url (str): 다운로드할 URL
+        """
+        host = urlparse(url).netloc
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.per_host_limit)
+                self._semaphores[host] = semaphore
+        
+        with semaphore:
+            yield
+
+
+class DownloadBudget:
+    """
+    여러 키워드가 나눠 쓰는 전역 동시 다운로드 한도
+    
+    슬롯이 부족하면 대기 중인 키워드를 돌아가며 한 슬롯씩 넘겨주므로,
+    URL이 많은 키워드가 한도를 독차지하지 못합니다.
+    """
+    
+    def __init__(self, limit=64):
+        """
+        Args:
+            limit (int): 전체 동시 다운로드 수
+        """
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._available = limit
+        self._waiters = OrderedDict()  # 키워드 -> 대기 이벤트 큐 (순서 = 다음 차례)
+    
+    def acquire(self, owner):
+        """
+        슬롯 확보 (없으면 차례가 올 때까지 대기)
+        
+        Args:
+            owner (str): 슬롯을 요청하는 작업 (키워드)
+        """
+        with self._lock:
+            if self._available > 0 and not self._waiters:
+                self._available -= 1
+                return
+            event = threading.Event()
+            self._waiters.setdefault(owner, deque()).append(event)
+        
+        event.wait()
+    
+    def release(self):
+        """슬롯 반납 (대기 중인 다음 키워드에 바로 넘김)"""
+        with self._lock:
+            if not self._waiters:
+                self._available += 1
+                return
+            
+            owner, events = self._waiters.popitem(last=False)
+            event = events.popleft()
+            if events:
+                # 남은 대기가 있으면 맨 뒤로 보내 다른 키워드가 먼저 받도록 함
+                self._waiters[owner] = events
+            event.set()
+    
+    @contextmanager
+    def slot(self, owner):
+        """
+        슬롯을 확보한 상태로 실행
+        
+        Args:
+            owner (str): 슬롯을 요청하는 작업 (키워드)
+        """
+        self.acquire(owner)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+class DownloadEngine:
+    """스레드 풀 기반 이미지 다운로드 엔진"""
+    
+    def __init__(self, crawler, max_workers=8, per_host_limit=4, budget=None, host_limiter=None):
+        """
+        다운로드 엔진 초기화
+        
+        Args:
+            crawler (GoogleImageCrawler): download_image를 제공하는 크롤러
+            max_workers (int): 동시에 실행할 다운로드 스레드 수
+            per_host_limit (int): 호스트별 최대 동시 다운로드 수
+            budget (DownloadBudget): 여러 크롤러가 공유하는 전역 동시 다운로드 한도 (선택)
+            host_limiter (HostLimiter): 여러 크롤러가 공유하는 호스트별 동시 다운로드 제한
+                (None이면 per_host_limit로 엔진 전용 제한 생성)
+        """
+        self.crawler = crawler
+        self.max_workers = max_workers
+        self.host_limiter = host_limiter or HostLimiter(per_host_limit)
+        self.budget = budget
+        self._executor = None
+    
+    def _get_executor(self):
+        """스레드 풀 생성 (최초 사용 시 한 번만)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="image-download"
+            )
+        return self._executor
+    
+    def _fetch(self, image_url, save_path, staging_name, keyword, near_index=None,
+               cancel_event=None, deadline=None):
+        """작업 스레드: 임시 파일명으로 이미지 다운로드 (near_index가 있으면 지각 해시도 계산)"""
+        with self.host_limiter.slot(image_url):
+            if self.budget is None:
+                result = self.crawler.download_image(
+                    image_url, save_path, staging_name, cancel_event, deadline, raise_errors=True
+                )
+            else:
+                with self.budget.slot(keyword):
+                    result = self.crawler.download_image(
+                        image_url, save_path, staging_name, cancel_event, deadline, raise_errors=True
+                    )
+        
+        if result is not None and near_index is not None:
+            perceptual_hash = near_index.hash_file(self.crawler.sink.reader(result.path))
+            result = result._replace(perceptual_hash=perceptual_hash)
+        
+        return result
+    
+    def _store_duplicate(self, staging_path, original_path, image_url, duplicate_mode):
+        """
+        내용이 같은 이미지 처리 (skip: 삭제, hardlink: duplicates 폴더에 원본 하드링크)
+        
+        Args:
+            staging_path (str): 받은 임시 파일 경로
+            original_path (str): 같은 내용으로 이미 저장된 파일 경로
+            image_url (str): 이미지 URL
+            duplicate_mode (str): "skip" 또는 "hardlink" (파일로 저장할 때만 적용)
+        """
+        sink = self.crawler.sink
+        if duplicate_mode == "hardlink" and sink.on_disk and os.path.exists(original_path):
+            duplicates_dir = os.path.join(os.path.dirname(original_path), "duplicates")
+            os.makedirs(duplicates_dir, exist_ok=True)
+            
+            stem, file_extension = os.path.splitext(os.path.basename(original_path))
+            url_hash = hashlib.blake2b(image_url.encode("utf-8"), digest_size=4).hexdigest()
+            link_path = os.path.join(duplicates_dir, f"{stem}_{url_hash}{file_extension}")
+            
+            try:
+                if not os.path.exists(link_path):
+                    os.link(original_path, link_path)
+            except OSError as e:
+                print(f"하드링크 생성 실패 ({link_path}): {e}")
+        
+        sink.discard(staging_path)
+    
+    def iter_stream(self, url_queue, save_path, keyword, downloaded_count, num_images=None,
+                    index_offset=0, on_saved=None,
+                    hash_store=None, duplicate_mode="skip", near_index=None,
+                    on_duplicate=None, on_failed=None, on_deferred=None, on_marker=None,
+                    deadline=None, grace_period=0.0, stop_event=None):
+        """
+        큐에서 URL을 꺼내 동시에 다운로드하고, 저장한 이미지를 하나씩 반환하는 제너레이터
+        (파이프라인의 다운로드/저장 단계)
+        
+        페이지를 로드하는 생산자가 URL을 넣는 동안 이미 들어온 URL을 작업
+        스레드로 받고, 호출한 스레드는 완료된 파일에 순서대로 번호를 매겨
+        저장합니다. 진행 중인 작업 수는 남은 목표 개수를 넘지 않으므로 필요
+        이상으로 다운로드하지 않고, 그동안 큐가 차면 생산자가 대기합니다.
+        호출한 쪽이 결과를 꺼내지 않으면 새 작업도 제출하지 않으므로, 중간에
+        반복을 멈추면 그 이후의 URL은 받지 않습니다. 메모리 저장 예산이 가득 차면
+        버퍼가 반납될 때까지 새 작업을 미루지만, 진행 중인 작업이 없어 반납될
+        버퍼가 없으면 경고를 출력하고 예산을 넘겨 계속 받습니다.
+        
+        다운로드는 임시 파일명으로 진행되고, 완료된 순서대로 번호를 매겨
+        {keyword}_{n}{ext}로 이름을 바꿉니다 (ext는 매직 바이트로 판별한 형식).
+        이미지가 아닌 응답은 실패로 처리하므로 개수에 포함되지 않습니다.
+        회로 차단기가 열린 호스트의 URL은 제출하지 않고 실패로 기록하지 않은 채
+        넘기며, 그 페이지도 완료로 표시하지 않습니다.
+        hash_store가 있으면 이미 저장된 이미지와 내용이 같은 파일은 번호를 매기지
+        않고 개수에도 포함하지 않습니다.
+        near_index가 있으면 크기 변경이나 재압축된 유사 이미지도 같은 방식으로 처리합니다.
+        
+        deadline이 지나면 새 작업을 제출하지 않고, 진행 중인 다운로드를 grace_period
+        동안만 기다려 그 안에 끝난 이미지까지 저장합니다. 남은 다운로드는 다음 읽기에서
+        중단되며, 속도 제한 차례가 deadline 뒤인 URL과 함께 실패로 기록하지 않고 그
+        페이지도 완료로 표시하지 않으므로 이어받기 시 다시 시도합니다.
+        
+        Args:
+            url_queue (queue.Queue): 이미지 URL 큐 (END_OF_URLS를 넣으면 종료,
+                문자열이 아닌 항목은 앞선 URL이 모두 처리된 뒤 on_marker로 전달)
+            save_path (str): 저장 경로
+            keyword (str): 검색 키워드 (파일명 접두사)
+            downloaded_count (int): 지금까지 다운로드한 개수
+            num_images (int): 목표 이미지 개수 (None이면 URL이 없을 때까지)
+            index_offset (int): 파일 번호 시작값 (기존 파일 다음 번호부터 저장할 때 사용)
+            on_saved (callable): 저장할 때마다 (이미지 URL, 파일 경로)로 호출할 함수
+            hash_store (ContentHashStore): 저장 경로의 콘텐츠 해시 저장소 (선택)
+            duplicate_mode (str): 중복 이미지 처리 방식 ("skip" 또는 "hardlink")
+            near_index (PerceptualIndex): 저장 경로의 지각 해시 인덱스 (선택)
+            on_duplicate (callable): 중복 이미지마다 (이미지 URL, 기존 파일 경로)로 호출할 함수
+            on_failed (callable): 다운로드에 실패할 때마다 (이미지 URL, 오류 메시지)로 호출할 함수
+            on_deferred (callable): 받지 않고 넘긴 URL마다 (이미지 URL)로 호출할 함수
+                (실패로 기록하지 않으며 이어받기 시 다시 시도)
+            on_marker (callable): 큐에 넣은 표시 항목(페이지 완료 등)을 받아 호출할 함수
+            deadline (float): 작업 제한 시각 (time.monotonic() 기준, None이면 제한 없음)
+            grace_period (float): 제한 시각 이후 진행 중인 다운로드를 기다릴 시간 (초)
+            stop_event (threading.Event): 설정되면 새 작업을 제출하지 않고 진행 중인 다운로드를
+                중단한 뒤 종료 (결과를 기다리는 중에도 다른 스레드에서 멈출 때 사용)
+        
+        Yields:
+            ImageResult: 저장한 이미지 정보 (path는 최종 파일 경로,
+                메모리 저장 시 data에 memoryview)
+        """
+        executor = self._get_executor()
+        sink = self.crawler.sink
+        target = num_images if num_images is not None else math.inf
+        # 결과를 기다리는 동안 미리 제출해 둘 최대 작업 수
+        max_pending = self.max_workers * 2
+        pending = {}
+        markers = deque()
+        exhausted = False
+        # 제한 시각 이후 새 작업 제출 중단, 설정하면 진행 중인 다운로드도 중단
+        winding_down = False
+        cancel_event = threading.Event()
+        # 받지 않고 넘긴 URL이 있으면 이후 페이지는 완료로 표시하지 않음 (이어받기 시 다시 로드)
+        deferred = False
+        # 메모리 저장 예산 초과 경고를 이미 출력했는지 여부
+        over_budget = False
+        
+        def submit_next():
+            """큐에서 URL 하나를 꺼내 작업 제출 (진행 중인 작업이 없을 때만 대기)"""
+            nonlocal exhausted, deferred
+            
+            while True:
+                try:
+                    item = url_queue.get(timeout=QUEUE_POLL_INTERVAL) if not pending else url_queue.get_nowait()
+                except queue.Empty:
+                    return bool(not pending)
+                
+                if item is END_OF_URLS:
+                    exhausted = True
+                    return False
+                
+                if not isinstance(item, str):
+                    # 앞서 제출한 작업이 모두 끝나면 전달
+                    markers.append((item, set(pending)))
+                    flush_markers()
+                    continue
+                
+                if self.crawler.circuit_breaker.should_skip(item):
+                    # 장애로 차단된 호스트의 URL은 작업 스레드에 넘기지 않고,
+                    # 실패로 기록하지 않음 (이어받기 시 회로가 닫히면 다시 시도)
+                    deferred = True
+                    if on_deferred is not None:
+                        on_deferred(item)
+                    continue
+                
+                # 확장자는 받은 내용의 형식을 확인한 뒤 정함
+                staging_name = f".{uuid.uuid4().hex}.tmp"
+                future = executor.submit(
+                    self._fetch, item, save_path, staging_name, keyword, near_index,
+                    cancel_event, deadline
+                )
+                pending[future] = (item, staging_name)
+                return True
+        
+        def stopped():
+            return stop_event is not None and stop_event.is_set()
+        
+        def fill_window(force=False):
+            # 메모리 저장 예산을 넘으면 버퍼가 반납될 때까지 새 작업을 제출하지 않음
+            # (force면 예산과 관계없이 한 개는 제출)
+            while (not exhausted and not winding_down and not stopped() and len(pending) < max_pending
+                   and (force or sink.has_capacity())
+                   and downloaded_count + len(pending) < target and submit_next()):
+                force = False
+        
+        def flush_markers():
+            while markers and not deferred and not (markers[0][1] & pending.keys()):
+                marker, _ = markers.popleft()
+                if on_marker is not None:
+                    on_marker(marker)
+        
+        try:
+            fill_window()
+            
+            while pending or (not exhausted and not winding_down and downloaded_count < target):
+                if stopped():
+                    print("다운로드 중지 요청")
+                    break
+                if deadline is not None and not winding_down and time.monotonic() >= deadline:
+                    winding_down = True
+                    print(f"작업 제한 시간 도달: 진행 중인 다운로드 {len(pending)}개를 최대 {grace_period}초 기다립니다.")
+                    continue
+                if winding_down and time.monotonic() >= deadline + grace_period:
+                    break
+                
+                if not pending:
+                    if sink.has_capacity() or sink.wait_for_capacity(QUEUE_POLL_INTERVAL):
+                        fill_window()
+                    else:
+                        # 진행 중인 작업이 없는데 예산이 꽉 찼으면 호출한 쪽이 결과를 반납하지
+                        # 않고 보관 중인 것이므로, 기다리지 않고 예산을 넘겨 계속 받음
+                        if not over_budget:
+                            over_budget = True
+                            print("경고: 메모리 저장 예산이 가득 찼지만 반납된 버퍼가 없어 예산을 넘겨 계속 받습니다. "
+                                  "결과를 다 쓰면 sink.release(path)로 반납하세요.")
+                        fill_window(force=True)
+                    flush_markers()
+                    continue
+                
+                done, _ = wait(pending, timeout=QUEUE_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                
+                for future in done:
+                    image_url, staging_name = pending.pop(future)
+                    staging_path = os.path.join(save_path, staging_name)
+                    
+                    error = None
+                    try:
+                        result = future.result()
+                    except DownloadCancelledError:
+                        # 제한 시간 전에 차례가 오지 않았거나 회로가 열려 요청하지 않은 URL은
+                        # 실패로 기록하지 않음 (이어받기 시 다시 시도)
+                        sink.discard(staging_path)
+                        deferred = True
+                        if on_deferred is not None:
+                            on_deferred(image_url)
+                        continue
+                    except Exception as e:
+                        print(f"이미지 다운로드 실패 ({image_url}): {e}")
+                        error = str(e) or type(e).__name__
+                        result = None
+                    
+                    original_path = None
+                    if result is not None and hash_store is not None:
+                        original_path = hash_store.get(result.sha256)
+                    if (result is not None and original_path is None
+                            and near_index is not None and result.perceptual_hash is not None):
+                        original_path = near_index.find(result.perceptual_hash)
+                    
+                    if original_path is not None:
+                        # 내용이 같은 이미지는 번호를 매기지 않음
+                        self._store_duplicate(staging_path, original_path, image_url, duplicate_mode)
+                        print(f"중복 이미지 건너뜀: {os.path.basename(original_path)}와 같거나 유사 ({image_url})")
+                        
+                        if on_duplicate is not None:
+                            on_duplicate(image_url, original_path)
+                    elif result is not None and downloaded_count < target:
+                        # 완료 순서대로 번호 부여
+                        downloaded_count += 1
+                        file_extension = (
+                            FORMAT_EXTENSIONS.get(result.format)
+                            or self.crawler.get_file_extension(image_url)
+                        )
+                        filename = f"{keyword}_{index_offset + downloaded_count}{file_extension}"
+                        file_path = os.path.join(save_path, filename)
+                        data = sink.commit(staging_path, file_path, result)
+                        if hash_store is not None:
+                            hash_store.add(result.sha256, file_path)
+                        if near_index is not None and result.perceptual_hash is not None:
+                            near_index.add(result.perceptual_hash, file_path)
+                        progress = f"{downloaded_count}/{num_images}" if num_images is not None else downloaded_count
+                        print(f"[{progress}] {filename} 다운로드 완료")
+                        
+                        if on_saved is not None:
+                            on_saved(image_url, file_path)
+                        yield result._replace(path=file_path, data=data)
+                    else:
+                        sink.discard(staging_path)
+                        if result is None and on_failed is not None:
+                            on_failed(image_url, error or "")
+                
+                flush_markers()
+                fill_window()
+            
+            flush_markers()
+        
+        finally:
+            # 중단된 경우 남은 작업 정리 (진행 중인 다운로드 중단, 임시 파일 삭제)
+            cancel_event.set()
+            if winding_down and pending:
+                print(f"제한 시간 내에 끝나지 않은 다운로드 {len(pending)}개 취소")
+            for future in pending:
+                future.cancel()
+            wait(pending)
+            for image_url, staging_name in pending.values():
+                sink.discard(os.path.join(save_path, staging_name))
+    
+    def close(self):
+        """스레드 풀 종료"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
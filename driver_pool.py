@@ -0,0 +1,213 @@
+"""
+브라우저 인스턴스 풀
+여러 키워드 작업이 미리 띄워 둔 크롬 세션을 돌려 쓰도록 관리합니다.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from selenium.common.exceptions import WebDriverException
+
+from crawler import GoogleImageCrawler, create_driver
+
+
+class PooledDriver:
+    """풀에서 관리하는 드라이버 세션"""
+    
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages_loaded = 0
+        self.jobs = 0
+
+
+class DriverPool:
+    """크롬 드라이버 풀"""
+    
+    def __init__(self, size=2, headless=True, max_pages_per_driver=50):
+        """
+        드라이버 풀 초기화
+        
+        Args:
+            size (int): 동시에 유지할 최대 브라우저 수
+            headless (bool): 브라우저 헤드리스 모드 여부
+            max_pages_per_driver (int): 이 페이지 수를 넘게 로드한 세션은 새로 띄움
+        """
+        self.size = size
+        self.headless = headless
+        self.max_pages_per_driver = max_pages_per_driver
+        
+        self._condition = threading.Condition()
+        self._idle = []
+        self._created = 0
+        self._closed = False
+    
+    def warm_up(self, count=None):
+        """
+        브라우저를 미리 실행해 둠 (병렬로 실행)
+        
+        Args:
+            count (int): 미리 띄울 브라우저 수 (None이면 풀 크기만큼)
+        """
+        with self._condition:
+            count = min(self.size if count is None else count, self.size - self._created)
+            self._created += max(count, 0)
+        
+        if count <= 0:
+            return
+        
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            futures = [executor.submit(create_driver, self.headless) for _ in range(count)]
+        
+        for future in futures:
+            with self._condition:
+                try:
+                    self._idle.append(PooledDriver(future.result()))
+                except Exception as e:
+                    print(f"브라우저 실행 실패: {e}")
+                    self._created -= 1
+                self._condition.notify()
+    
+    def acquire(self, timeout=None):
+        """
+        유휴 세션을 꺼내거나, 여유가 있으면 새 브라우저 실행
+        
+        Args:
+            timeout (float): 세션을 기다릴 최대 시간 (초)
+        
+        Returns:
+            PooledDriver: 드라이버 세션
+        """
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("드라이버 풀이 이미 종료되었습니다.")
+                if self._idle:
+                    return self._idle.pop()
+                if self._created < self.size:
+                    self._created += 1
+                    break
+                if not self._condition.wait(timeout):
+                    raise TimeoutError("사용 가능한 브라우저가 없습니다.")
+        
+        try:
+            return PooledDriver(create_driver(self.headless))
+        except Exception:
+            with self._condition:
+                self._created -= 1
+                self._condition.notify()
+            raise
+    
+    def release(self, session, crashed=False):
+        """
+        세션 반납 (상태 초기화 후 재사용하거나, 오래됐거나 죽은 세션은 종료)
+        
+        Args:
+            session (PooledDriver): 반납할 세션
+            crashed (bool): 작업 중 드라이버 오류가 발생했는지 여부
+        """
+        session.jobs += 1
+        recycle = (
+            crashed
+            or self._closed
+            or session.pages_loaded >= self.max_pages_per_driver
+            or not self._reset(session.driver)
+        )
+        
+        if recycle:
+            self._quit(session.driver)
+        
+        with self._condition:
+            if recycle:
+                self._created -= 1
+            else:
+                self._idle.append(session)
+            self._condition.notify()
+    
+    @staticmethod
+    def _reset(driver):
+        """
+        다음 작업을 위해 쿠키, 저장소, 추가 창을 정리
+        
+        Returns:
+            bool: 초기화 성공 여부 (실패하면 세션을 버림)
+        """
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            
+            try:
+                driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+                driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+                    "origin": "https://www.google.com",
+                    "storageTypes": "local_storage,session_storage,indexeddb,cache_storage"
+                })
+            except WebDriverException:
+                driver.delete_all_cookies()
+            
+            driver.get("about:blank")
+            return True
+        
+        except WebDriverException as e:
+            print(f"브라우저 세션 초기화 실패 (새 세션으로 교체): {e}")
+            return False
+    
+    @staticmethod
+    def _quit(driver):
+        """드라이버 종료 (이미 죽은 경우 무시)"""
+        try:
+            driver.quit()
+        except Exception:
+            pass
+    
+    @contextmanager
+    def crawler(self, **crawler_kwargs):
+        """
+        풀의 브라우저를 사용하는 크롤러 대여
+        
+        Args:
+            **crawler_kwargs: GoogleImageCrawler에 전달할 인자
+        
+        Yields:
+            GoogleImageCrawler: 풀 드라이버를 사용하는 크롤러
+        """
+        session = self.acquire()
+        crashed = False
+        crawler = None
+        
+        try:
+            crawler = GoogleImageCrawler(
+                headless=self.headless,
+                driver=session.driver,
+                **crawler_kwargs
+            )
+            yield crawler
+        
+        except WebDriverException:
+            crashed = True
+            raise
+        
+        finally:
+            if crawler is not None:
+                session.pages_loaded += crawler.pages_loaded
+                crawler.close()
+            self.release(session, crashed=crashed)
+    
+    def close(self):
+        """모든 브라우저 종료"""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._created -= len(idle)
+            self._condition.notify_all()
+        
+        for session in idle:
+            self._quit(session.driver)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
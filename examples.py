@@ -4,6 +4,14 @@
 """
 
 from crawler import GoogleImageCrawler
+from async_crawler import AsyncGoogleImageCrawler
+from http_client import HttpClient
+from driver_pool import DriverPool
+from dedup import UrlIndex
+from rate_limiter import HostRateLimiter
+from retry_policy import CircuitBreaker
+from sinks import SHARD_NAME_PATTERN, iter_shard_entries
+import asyncio
 import os
 
 
@@ -29,17 +37,31 @@ def example_2_multiple_keywords():
     
     keywords = ["강아지", "고양이", "새"]
     
-    for keyword in keywords:
-        crawler = GoogleImageCrawler(headless=True)  # headless 모드로 빠르게 실행
-        
-        try:
-            crawler.crawl_images(
-                keyword=keyword,
-                num_images=20,
-                save_dir="downloads"
-            )
-        finally:
-            crawler.close()
+    # 키워드 간 HTTP 연결 풀, 브라우저, URL 인덱스, 호스트별 속도 제한과 회로 차단기 공유
+    # (headless 모드로 빠르게 실행)
+    http_client = HttpClient()
+    driver_pool = DriverPool(size=1, headless=True)
+    url_index = UrlIndex(os.path.join("downloads", ".url_index.log"))
+    rate_limiter = HostRateLimiter()
+    circuit_breaker = CircuitBreaker()
+    
+    try:
+        for keyword in keywords:
+            with driver_pool.crawler(
+                http_client=http_client,
+                url_index=url_index,
+                rate_limiter=rate_limiter,
+                circuit_breaker=circuit_breaker
+            ) as crawler:
+                crawler.crawl_images(
+                    keyword=keyword,
+                    num_images=20,
+                    save_dir="downloads"
+                )
+    finally:
+        driver_pool.close()
+        http_client.close()
+        url_index.close()
 
 
 def example_3_headless_mode():
@@ -65,18 +87,40 @@ def example_4_check_downloads():
     downloads_dir = "downloads"
     
     if os.path.exists(downloads_dir):
-        for keyword_dir in os.listdir(downloads_dir):
-            path = os.path.join(downloads_dir, keyword_dir)
-            if os.path.isdir(path):
-                images = os.listdir(path)
-                print(f"\n{keyword_dir}: {len(images)}개 이미지")
+        for keyword_dir in os.scandir(downloads_dir):
+            if keyword_dir.is_dir():
+                # 샤드로 저장한 이미지는 색인 파일만 읽어서 셈
+                num_images = sum(1 for _ in iter_shard_entries(keyword_dir.path))
+                num_images += sum(
+                    1 for entry in os.scandir(keyword_dir.path)
+                    if entry.is_file() and not entry.name.startswith(".")
+                    and not SHARD_NAME_PATTERN.match(entry.name)
+                    and not entry.name.endswith(".idx")
+                )
+                print(f"\n{keyword_dir.name}: {num_images}개 이미지")
     else:
         print("downloads 디렉토리가 없습니다.")
 
 
+def example_5_async_crawl():
+    """예제 5: asyncio로 여러 키워드 동시 크롤링"""
+    print("\n=== 예제 5: asyncio 크롤링 ===")
+    
+    async def run():
+        async with AsyncGoogleImageCrawler(headless=True) as crawler:
+            # 페이지 로드는 순서대로, 이미지 다운로드는 키워드 간에도 동시에 진행
+            await asyncio.gather(
+                crawler.crawl_images("바다", num_images=20),
+                crawler.crawl_images("산", num_images=20)
+            )
+    
+    asyncio.run(run())
+
+
 if __name__ == "__main__":
     # 실행할 예제 선택
     # example_1_basic_crawl()
     # example_2_multiple_keywords()
+    # example_5_async_crawl()
     example_3_headless_mode()
     example_4_check_downloads()
@@ -7,8 +7,13 @@ import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, filedialog
 import threading
 import os
-from pathlib import Path
 from crawler import GoogleImageCrawler
+from http_client import HttpClient
+from driver_pool import DriverPool
+from dedup import UrlIndex
+from rate_limiter import HostRateLimiter
+from retry_policy import CircuitBreaker
+from checkpoint import CrawlCheckpoint
 
 
 class CrawlerGUI:
@@ -26,6 +31,8 @@ class CrawlerGUI:
         
         self.crawler = None
         self.is_running = False
+        # 중지 버튼을 누르면 설정 (다음 이미지를 기다리는 중에도 크롤러가 바로 멈춤)
+        self.stop_event = threading.Event()
         
         self.setup_ui()
     
@@ -73,6 +80,14 @@ class CrawlerGUI:
         )
         headless_check.grid(row=3, column=0, columnspan=2, sticky=tk.W, pady=5)
         
+        self.resume_var = tk.BooleanVar(value=False)
+        resume_check = ttk.Checkbutton(
+            settings_frame,
+            text="중단된 작업 이어받기",
+            variable=self.resume_var
+        )
+        resume_check.grid(row=4, column=0, columnspan=2, sticky=tk.W, pady=5)
+        
         settings_frame.columnconfigure(1, weight=1)
         
         # === 중단: 키워드 목록 ===
@@ -189,6 +204,7 @@ class CrawlerGUI:
     def _crawl_single(self, keyword, num_images, save_dir):
         """단일 크롤링 실행"""
         self.is_running = True
+        self.stop_event.clear()
         self.progress_var.set(0)
         
         try:
@@ -216,6 +232,16 @@ class CrawlerGUI:
     def _crawl_batch(self, keywords, num_images, save_dir):
         """일괄 크롤링 실행"""
         self.is_running = True
+        self.stop_event.clear()
+        
+        # 모든 키워드가 하나의 연결 풀과 브라우저를 공유
+        http_client = HttpClient()
+        driver_pool = DriverPool(size=1, headless=self.headless_var.get())
+        # 이미 받은 URL 인덱스는 한 번만 읽어 모든 키워드가 공유
+        url_index = UrlIndex(os.path.join(save_dir, ".url_index.log"))
+        # 같은 호스트의 요청 속도와 장애 판정은 키워드와 관계없이 함께 관리
+        rate_limiter = HostRateLimiter()
+        circuit_breaker = CircuitBreaker()
         
         try:
             self.log(f"\n{'='*50}")
@@ -239,8 +265,13 @@ class CrawlerGUI:
                 
                 self.log(f"\n[{idx+1}/{total_keywords}] '{keyword}' 검색 중...")
                 
-                crawler = GoogleImageCrawler(headless=self.headless_var.get())
-                self._run_crawler(crawler, keyword, num_images, save_dir)
+                with driver_pool.crawler(
+                    http_client=http_client,
+                    url_index=url_index,
+                    rate_limiter=rate_limiter,
+                    circuit_breaker=circuit_breaker
+                ) as crawler:
+                    self._run_crawler(crawler, keyword, num_images, save_dir)
             
             if self.is_running:
                 self.log(f"\n{'='*50}")
@@ -254,81 +285,73 @@ class CrawlerGUI:
             messagebox.showerror("오류", f"크롤링 중 오류 발생:\n{e}")
         
         finally:
+            driver_pool.close()
+            http_client.close()
+            url_index.close()
             self.is_running = False
     
     def _run_crawler(self, crawler, keyword, num_images, save_dir):
         """크롤러 실행 (로그 출력 포함)"""
+        save_path = os.path.join(save_dir, keyword)
+        self.log(f"저장 경로: {save_path}")
+        
+        # 이어받기 시 num_images에는 이전 실행분이 포함되므로 진행률도 그 개수부터 계산
+        downloaded_count = 0
+        if self.resume_var.get():
+            checkpoint = CrawlCheckpoint(save_path)
+            if checkpoint.resumable:
+                downloaded_count = checkpoint.downloaded
+        previous_count = downloaded_count
+        
+        def on_page_loaded(search_url, url_count):
+            self.log(f"페이지 로드: {search_url}")
+            self.log(f"  → {url_count}개의 이미지 URL 추출됨")
+        
+        images = crawler.iter_images(
+            keyword,
+            num_images,
+            save_dir,
+            resume=self.resume_var.get(),
+            on_page_loaded=on_page_loaded,
+            cancel_event=self.stop_event
+        )
+        
         try:
-            # 저장 경로 생성
-            save_path = os.path.join(save_dir, keyword)
-            Path(save_path).mkdir(parents=True, exist_ok=True)
-            
-            self.log(f"저장 경로: {save_path}")
-            
-            downloaded_count = 0
-            page_start = 0
-            consecutive_failures = 0
-            
-            while downloaded_count < num_images and consecutive_failures < 3:
+            for result in images:
+                # 중지 버튼을 누르면 크롤러가 남은 페이지 로드와 다운로드를 중단하고 반복을 끝냄
                 if not self.is_running:
                     break
                 
-                # 검색 URL로 이동
-                search_url = crawler.get_search_url(keyword, page_start)
-                self.log(f"페이지 로드: {search_url}")
-                crawler.driver.get(search_url)
-                
-                import time
-                time.sleep(4)
-                
-                # 이미지 로드를 위해 스크롤
-                crawler.scroll_and_load_images(num_scrolls=5)
-                
-                # 이미지 URL 추출
-                image_urls = crawler.get_image_urls()
-                self.log(f"  → {len(image_urls)}개의 이미지 URL 추출됨")
-                
-                if len(image_urls) == 0:
-                    consecutive_failures += 1
-                    page_start += 30
-                    continue
-                else:
-                    consecutive_failures = 0
-                
-                # 이미지 다운로드
-                for idx, image_url in enumerate(image_urls):
-                    if not self.is_running or downloaded_count >= num_images:
-                        break
-                    
-                    # 파일명 생성
-                    file_extension = crawler.get_file_extension(image_url)
-                    filename = f"{keyword}_{downloaded_count + 1}{file_extension}"
-                    
-                    # 이미지 다운로드
-                    if crawler.download_image(image_url, save_path, filename):
-                        downloaded_count += 1
-                        progress = (downloaded_count / num_images) * 100
-                        self.progress_var.set(min(progress, 99))
-                        self.progress_label.config(
-                            text=f"다운로드: {downloaded_count}/{num_images}"
-                        )
-                        
-                        if downloaded_count % 5 == 0:  # 5개마다 로그
-                            self.log(f"  [{downloaded_count}/{num_images}] {filename} 완료")
-                    
-                    time.sleep(0.3)
+                downloaded_count += 1
+                progress = (downloaded_count / num_images) * 100
+                self.progress_var.set(min(progress, 99))
+                self.progress_label.config(
+                    text=f"다운로드: {downloaded_count}/{num_images}"
+                )
                 
-                page_start += 30
+                if downloaded_count % 5 == 0:  # 5개마다 로그
+                    self.log(
+                        f"  [{downloaded_count}/{num_images}] "
+                        f"{os.path.basename(result.path)} 완료 ({result.bytes / 1024:.0f}KB)"
+                    )
             
-            self.log(f"'{keyword}' 크롤링 완료: {downloaded_count}개 다운로드")
+            if previous_count:
+                self.log(
+                    f"'{keyword}' 크롤링 완료: {downloaded_count}개 다운로드 "
+                    f"(이번 실행 {downloaded_count - previous_count}개)"
+                )
+            else:
+                self.log(f"'{keyword}' 크롤링 완료: {downloaded_count}개 다운로드")
             
         finally:
+            images.close()
             crawler.close()
     
     def stop_crawler(self):
         """크롤링 중지"""
         if self.is_running:
             self.is_running = False
+            self.stop_event.set()
             self.log("\n⏹️  크롤링을 중지하고 있습니다...")
             self.progress_label.config(text="중지됨")
         else:
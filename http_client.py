@@ -0,0 +1,156 @@
+"""
+HTTP 세션 관리
+keep-alive 연결 풀을 재사용하는 requests 세션 래퍼
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import DecodeError, ProtocolError, ReadTimeoutError, SSLError
+from urllib3.util.retry import Retry
+
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+
+def iter_available(response, max_bytes=64 * 1024):
+    """
+    응답 본문을 도착한 만큼씩 반환하는 제너레이터
+    
+    iter_content는 chunk_size만큼 모이거나 본문이 끝날 때까지 반환하지 않으므로,
+    조금씩 흘려보내는 응답에서는 호출한 쪽이 중간에 시간 제한이나 취소를 확인할 수
+    없습니다. 여기서는 소켓에서 한 번 읽은 만큼(최대 max_bytes)을 바로 반환합니다.
+    
+    Args:
+        response (requests.Response): stream=True로 받은 응답
+        max_bytes (int): 한 번에 반환할 최대 바이트 수
+    
+    Yields:
+        bytes: 받은 본문 조각 (Content-Encoding은 풀어서 반환)
+    
+    Raises:
+        requests.exceptions.RequestException: iter_content와 같은 예외로 변환한 읽기 오류
+    """
+    read1 = getattr(response.raw, "read1", None)
+    if read1 is None:
+        # urllib3 2.3 미만은 read1이 없으므로 max_bytes 단위로 읽음
+        yield from response.iter_content(chunk_size=max_bytes)
+        return
+    
+    while True:
+        try:
+            data = read1(max_bytes, decode_content=True)
+        except ProtocolError as e:
+            raise requests.exceptions.ChunkedEncodingError(e)
+        except DecodeError as e:
+            raise requests.exceptions.ContentDecodingError(e)
+        except ReadTimeoutError as e:
+            raise requests.exceptions.ConnectionError(e)
+        except SSLError as e:
+            raise requests.exceptions.SSLError(e)
+        
+        if not data:
+            return
+        yield data
+
+
+class HttpClient:
+    """연결 풀을 공유하는 HTTP 클라이언트"""
+    
+    def __init__(self, pool_size=10, host_pool_sizes=None, max_hosts=100,
+                 retries=0, backoff_factor=0.5):
+        """
+        HTTP 클라이언트 초기화
+        
+        Args:
+            pool_size (int): 호스트당 유지할 기본 연결 수
+            host_pool_sizes (dict): 호스트별 연결 수 (예: {"encrypted-tbn0.gstatic.com": 16})
+            max_hosts (int): 연결 풀을 유지할 최대 호스트 수
+            retries (int): 연결 오류 및 일시적 서버 오류 재시도 횟수
+                (기본값 0: 이미지 다운로드 재시도는 크롤러의 RetryPolicy가 백오프와
+                호스트별 회로 차단을 함께 적용하여 처리)
+            backoff_factor (float): 재시도 간 지수 백오프 계수 (초)
+        """
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": USER_AGENT})
+        
+        self.retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            # 429/503은 호스트별 속도 제한(HostRateLimiter)이 감속 후 다시 요청
+            status_forcelist=(500, 502, 504),
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            raise_on_status=False
+        )
+        
+        # 기본 어댑터 (모든 호스트)
+        default_adapter = HTTPAdapter(
+            pool_connections=max_hosts,
+            pool_maxsize=pool_size,
+            max_retries=self.retry
+        )
+        self.session.mount("http://", default_adapter)
+        self.session.mount("https://", default_adapter)
+        
+        # 호스트별 어댑터 (더 긴 접두사가 우선 적용됨)
+        for host, size in (host_pool_sizes or {}).items():
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=size,
+                max_retries=self.retry
+            )
+            self.session.mount(f"http://{host}/", adapter)
+            self.session.mount(f"https://{host}/", adapter)
+    
+    def get(self, url, **kwargs):
+        """
+        GET 요청
+        
+        Args:
+            url (str): 요청 URL
+            **kwargs: requests.Session.get에 전달할 인자
+        
+        Returns:
+            requests.Response: 응답 객체
+        """
+        return self.session.get(url, **kwargs)
+    
+    def stats(self):
+        """
+        호스트별 연결 재사용 통계
+        
+        Returns:
+            dict: {호스트: {"requests": 요청 수, "connections": 새 연결 수, "reused": 재사용 수}}
+        """
+        result = {}
+        for adapter in set(self.session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                entry = result.setdefault(pool.host, {"requests": 0, "connections": 0, "reused": 0})
+                entry["requests"] += pool.num_requests
+                entry["connections"] += pool.num_connections
+                entry["reused"] += max(pool.num_requests - pool.num_connections, 0)
+        
+        return result
+    
+    def summary(self):
+        """
+        전체 연결 재사용 요약
+        
+        Returns:
+            tuple: (요청 수, 새 연결 수, 재사용 비율)
+        """
+        stats = self.stats()
+        requests_made = sum(s["requests"] for s in stats.values())
+        connections = sum(s["connections"] for s in stats.values())
+        reuse_ratio = (requests_made - connections) / requests_made if requests_made else 0.0
+        return requests_made, connections, reuse_ratio
+    
+    def close(self):
+        """세션 및 연결 풀 종료"""
+        self.session.close()
@@ -0,0 +1,176 @@
+"""
+이미지 URL 추출
+검색 결과 페이지에서 섬네일 이미지 URL을 한 번의 WebDriver 호출로 수집하거나,
+저장된 HTML(page_source)을 브라우저 없이 파싱하여 수집합니다.
+"""
+
+import json
+import re
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup, FeatureNotFound
+
+
+# Google 이미지에서 사용되는 대표적인 섬네일 선택자
+IMAGE_SELECTORS = [
+    "img.rg_i",
+    "img.Q4LuWd",
+    "div.isv-r img",
+    "img"
+]
+
+# 브라우저 안에서 한 번에 실행되는 추출 스크립트
+# (요소마다 get_attribute를 호출하던 방식과 같은 규칙으로 URL을 고름)
+EXTRACT_IMAGE_URLS_JS = """
+var selectors = arguments[0];
+var urls = [];
+var seen = new Set();
+
+for (var i = 0; i < selectors.length; i++) {
+    var images;
+    try {
+        images = document.querySelectorAll(selectors[i]);
+    } catch (e) {
+        continue;
+    }
+    
+    for (var j = 0; j < images.length; j++) {
+        var img = images[j];
+        
+        // 여러 속성에서 URL 찾기 (썸네일은 base64일 수 있으므로 http인지 확인)
+        var src = img.src
+            || img.getAttribute("data-src")
+            || img.getAttribute("data-iurl")
+            || img.getAttribute("data-srcset");
+        
+        // 일부 경우 부모 링크에 실제 이미지 URL이 포함될 수 있음
+        if (!src) {
+            var link = img.closest("a[href]");
+            if (link && link.href.indexOf("imgurl=") !== -1) {
+                src = link.href.split("imgurl=").pop().split("&")[0];
+            }
+        }
+        
+        if (src && src.indexOf("http") !== -1 && !seen.has(src)) {
+            seen.add(src);
+            urls.push(src);
+        }
+    }
+}
+
+return urls;
+"""
+
+
+# 페이지 스크립트의 JSON 데이터에 들어 있는 원본 이미지 항목: ["https://...", 높이, 너비]
+FULL_RES_URL_PATTERN = re.compile(r'\["(https?://[^"]+?)",(\d+),(\d+)\]')
+
+# 상대 경로 링크(/imgres?imgurl=...)를 해석할 기준 URL
+GOOGLE_BASE_URL = "https://www.google.com/"
+
+
+def make_soup(html):
+    """
+    HTML 파싱 (lxml이 있으면 사용하고, 없으면 내장 파서 사용)
+    
+    Args:
+        html (str): HTML 문자열
+    
+    Returns:
+        BeautifulSoup: 파싱된 문서
+    """
+    try:
+        return BeautifulSoup(html, "lxml")
+    except FeatureNotFound:
+        return BeautifulSoup(html, "html.parser")
+
+
+def extract_full_res_urls(soup):
+    """
+    스크립트 태그의 JSON 데이터에서 원본 해상도 이미지 URL 추출
+    
+    Args:
+        soup (BeautifulSoup): 파싱된 문서
+    
+    Returns:
+        list: 이미지 URL 리스트
+    """
+    urls = []
+    for script in soup.find_all("script"):
+        text = script.string
+        if not text or "http" not in text:
+            continue
+        
+        for match in FULL_RES_URL_PATTERN.finditer(text):
+            raw_url = match.group(1)
+            try:
+                # JSON 문자열 이스케이프(\u003d 등) 해제
+                urls.append(json.loads(f'"{raw_url}"'))
+            except ValueError:
+                urls.append(raw_url)
+    
+    return urls
+
+
+def extract_image_urls(html, base_url=GOOGLE_BASE_URL, include_full_res=True):
+    """
+    HTML에서 이미지 URL 추출 (브라우저 없이 동작)
+    
+    get_image_urls와 같은 선택자와 속성 순서를 사용하고, 상위 링크의
+    imgurl= 값과 스크립트 JSON 데이터의 원본 이미지 URL도 수집합니다.
+    
+    Args:
+        html (str): HTML 문자열 (driver.page_source 또는 저장된 파일 내용)
+        base_url (str): 상대 경로 해석 기준 URL
+        include_full_res (bool): JSON 데이터의 원본 이미지 URL 포함 여부
+    
+    Returns:
+        list: 이미지 URL 리스트
+    """
+    soup = make_soup(html)
+    image_urls = []
+    seen_urls = set()
+    
+    def add(url):
+        if url and "http" in url and url not in seen_urls:
+            image_urls.append(url)
+            seen_urls.add(url)
+    
+    for selector in IMAGE_SELECTORS:
+        for img in soup.select(selector):
+            src = (
+                img.get("src")
+                or img.get("data-src")
+                or img.get("data-iurl")
+                or img.get("data-srcset")
+            )
+            
+            if src:
+                src = urljoin(base_url, src)
+            else:
+                # 일부 경우 부모 링크에 실제 이미지 URL이 포함될 수 있음
+                link = img.find_parent("a", href=True)
+                if link and "imgurl=" in link["href"]:
+                    src = link["href"].split("imgurl=")[-1].split("&")[0]
+            
+            add(src)
+    
+    if include_full_res:
+        for url in extract_full_res_urls(soup):
+            add(url)
+    
+    return image_urls
+
+
+def extract_image_urls_from_file(file_path, **kwargs):
+    """
+    저장된 HTML 파일에서 이미지 URL 추출
+    
+    Args:
+        file_path (str): HTML 파일 경로
+        **kwargs: extract_image_urls에 전달할 인자
+    
+    Returns:
+        list: 이미지 URL 리스트
+    """
+    with open(file_path, encoding="utf-8") as f:
+        return extract_image_urls(f.read(), **kwargs)
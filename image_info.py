@@ -0,0 +1,151 @@
+"""
+이미지 헤더 정보
+파일 앞부분 바이트만으로 이미지 형식과 크기(가로, 세로)를 읽습니다.
+이미지를 디코딩하지 않으므로 다운로드 중에 받은 첫 청크로 바로 확인할 수 있습니다.
+"""
+
+import struct
+
+
+# 크기를 찾기 위해 보관할 최대 헤더 크기 (JPEG는 EXIF 뒤에 크기 정보가 있음)
+HEADER_BYTES = 64 * 1024
+
+# 형식을 판별하는 데 필요한 앞부분 바이트 수 (WebP는 12바이트)
+SNIFF_BYTES = 16
+
+# 이미지 형식별 저장 확장자
+FORMAT_EXTENSIONS = {
+    "jpeg": ".jpg",
+    "png": ".png",
+    "gif": ".gif",
+    "webp": ".webp",
+    "bmp": ".bmp"
+}
+
+# 본문을 확인해 봐야 하는 일반 바이너리 Content-Type
+_BINARY_CONTENT_TYPES = ("application/octet-stream", "binary/octet-stream")
+
+# 크기 정보가 있는 JPEG SOF 마커 (DHT, JPG, DAC 제외)
+_JPEG_SOF_MARKERS = frozenset(
+    marker for marker in range(0xC0, 0xD0) if marker not in (0xC4, 0xC8, 0xCC)
+)
+
+
+def image_format(header):
+    """
+    헤더의 매직 바이트로 이미지 형식 판별
+    
+    Args:
+        header (bytes): 파일 앞부분 바이트
+    
+    Returns:
+        str: "jpeg", "png", "gif", "webp", "bmp" 중 하나 (이미지가 아니면 None)
+    """
+    if header[:3] == b"\xff\xd8\xff":
+        return "jpeg"
+    if header[:8] == b"\x89PNG\r\n\x1a\n":
+        return "png"
+    if header[:6] in (b"GIF87a", b"GIF89a"):
+        return "gif"
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "webp"
+    if header[:2] == b"BM":
+        return "bmp"
+    return None
+
+
+def is_image_content_type(content_type):
+    """
+    Content-Type 헤더가 이미지일 수 있는지 확인
+    
+    헤더가 없거나 일반 바이너리 형식이면 본문의 매직 바이트로 판단해야 하므로
+    True를 반환합니다. text/html 같은 명백한 비이미지 응답만 거릅니다.
+    
+    Args:
+        content_type (str): Content-Type 헤더 값 (없으면 None)
+    
+    Returns:
+        bool: 이미지일 수 있으면 True
+    """
+    if not content_type:
+        return True
+    
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type.startswith("image/") or media_type in _BINARY_CONTENT_TYPES
+
+
+def _jpeg_size(header):
+    """JPEG 세그먼트를 따라가며 SOF 마커의 크기 정보 읽기"""
+    position = 2
+    while position + 9 <= len(header):
+        if header[position] != 0xFF:
+            return None
+        marker = header[position + 1]
+        
+        if marker == 0xFF:
+            # 채움 바이트
+            position += 1
+            continue
+        if marker in (0x01, 0xD8) or 0xD0 <= marker <= 0xD7:
+            # 길이가 없는 마커
+            position += 2
+            continue
+        
+        if marker in _JPEG_SOF_MARKERS:
+            height, width = struct.unpack(">HH", header[position + 5:position + 9])
+            return width, height
+        
+        segment_length = struct.unpack(">H", header[position + 2:position + 4])[0]
+        position += 2 + segment_length
+    
+    return None
+
+
+def _webp_size(header):
+    """WebP 첫 청크(VP8, VP8L, VP8X)의 크기 정보 읽기"""
+    chunk = header[12:16]
+    
+    if chunk == b"VP8 " and len(header) >= 30:
+        width, height = struct.unpack("<HH", header[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    
+    if chunk == b"VP8L" and len(header) >= 25:
+        b0, b1, b2, b3 = header[21:25]
+        width = 1 + (b0 | (b1 & 0x3F) << 8)
+        height = 1 + (b1 >> 6 | b2 << 2 | (b3 & 0x0F) << 10)
+        return width, height
+    
+    if chunk == b"VP8X" and len(header) >= 30:
+        width = 1 + int.from_bytes(header[24:27], "little")
+        height = 1 + int.from_bytes(header[27:30], "little")
+        return width, height
+    
+    return None
+
+
+def image_size(header):
+    """
+    헤더 바이트에서 이미지 크기 읽기
+    
+    Args:
+        header (bytes): 파일 앞부분 바이트 (HEADER_BYTES 정도면 충분)
+    
+    Returns:
+        tuple: (가로, 세로) 픽셀 (형식을 모르거나 헤더가 부족하면 None)
+    """
+    header = bytes(header)
+    kind = image_format(header)
+    
+    if kind == "jpeg":
+        return _jpeg_size(header)
+    if kind == "png" and len(header) >= 24 and header[12:16] == b"IHDR":
+        return struct.unpack(">II", header[16:24])
+    if kind == "gif" and len(header) >= 10:
+        return struct.unpack("<HH", header[6:10])
+    if kind == "webp":
+        return _webp_size(header)
+    if kind == "bmp" and len(header) >= 26:
+        width, height = struct.unpack("<ii", header[18:26])
+        return width, abs(height)
+    
+    return None
@@ -0,0 +1,249 @@
+"""
+키워드별 다운로드 매니페스트
+저장한 이미지마다 출처 URL, 검색 페이지 위치, HTTP 응답 정보, 크기, 해시, 소요 시간을
+저장 디렉토리의 JSONL 파일에 추가 기록하고, URL이나 해시로 바로 조회할 수 있게 합니다.
+
+사용법 (매니페스트 조회):
+    python3 manifest.py downloads/고양이 --url https://example.com/cat.jpg
+    python3 manifest.py downloads/고양이 --sha256 <해시>
+    python3 manifest.py downloads/고양이 --summary
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+
+
+class Manifest:
+    """
+    저장 디렉토리의 다운로드 매니페스트 (.manifest.jsonl)
+    
+    기록은 버퍼에 쌓았다가 flush_every개마다 파일에 반영하므로 다운로드 중 비용이
+    거의 없습니다. 조회용 색인(URL, SHA-256 → 줄 위치)은 처음 조회할 때 파일을 한 번
+    읽어 만들고, 이후 기록은 색인에 바로 추가합니다. 색인에는 줄 위치만 두므로
+    조회할 때 해당 줄 하나만 읽습니다.
+    """
+    
+    FILE_NAME = ".manifest.jsonl"
+    
+    def __init__(self, save_path, flush_every=50):
+        """
+        매니페스트 열기 (파일이 없으면 새로 생성)
+        
+        Args:
+            save_path (str): 이미지 저장 경로 (키워드 폴더)
+            flush_every (int): 이 개수만큼 기록될 때마다 파일에 반영
+        """
+        self.file_path = os.path.join(save_path, self.FILE_NAME)
+        self.flush_every = flush_every
+        
+        self._lock = threading.Lock()
+        self._file = None
+        self._unflushed = 0
+        self._size = os.path.getsize(self.file_path) if os.path.exists(self.file_path) else 0
+        
+        # 조회용 색인 (처음 조회할 때 생성)
+        self._by_url = None
+        self._by_hash = None
+    
+    def _build_index(self):
+        """파일을 한 번 읽어 URL/해시 → 줄 위치 색인 구성"""
+        by_url = {}
+        by_hash = {}
+        
+        if os.path.exists(self.file_path):
+            with open(self.file_path, "rb") as f:
+                offset = 0
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # 기록 도중 중단된 줄은 무시
+                        record = None
+                    if record is not None:
+                        self._index_record(by_url, by_hash, record, offset)
+                    offset += len(line)
+        
+        self._by_url = by_url
+        self._by_hash = by_hash
+    
+    @staticmethod
+    def _index_record(by_url, by_hash, record, offset):
+        """기록 하나를 색인에 추가 (같은 URL은 마지막 기록, 같은 해시는 모든 기록)"""
+        if record.get("url"):
+            by_url[record["url"]] = offset
+        if record.get("sha256"):
+            by_hash.setdefault(record["sha256"], []).append(offset)
+    
+    def record(self, result, page_start=None):
+        """
+        저장한 이미지 기록
+        
+        Args:
+            result (ImageResult): 다운로드 결과 (path는 최종 파일 경로)
+            page_start (int): 이미지 URL을 찾은 검색 페이지 위치
+        """
+        record = {
+            "file": os.path.basename(result.path),
+            "url": result.url,
+            "page_start": page_start,
+            "status": result.status,
+            "content_type": result.content_type,
+            "format": result.format,
+            "bytes": result.bytes,
+            "width": result.width,
+            "height": result.height,
+            "sha256": result.sha256,
+            "perceptual_hash": (
+                f"{result.perceptual_hash:016x}" if result.perceptual_hash is not None else None
+            ),
+            "first_byte": round(result.first_byte, 4) if result.first_byte is not None else None,
+            "latency": round(result.latency, 4),
+            "time": round(time.time(), 3)
+        }
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.file_path, "ab")
+            self._file.write(line)
+            
+            if self._by_url is not None:
+                self._index_record(self._by_url, self._by_hash, record, self._size)
+            self._size += len(line)
+            
+            self._unflushed += 1
+            if self._unflushed >= self.flush_every:
+                self._file.flush()
+                self._unflushed = 0
+    
+    def _read_at(self, offsets):
+        """줄 위치의 기록 읽기"""
+        records = []
+        with open(self.file_path, "rb") as f:
+            for offset in offsets:
+                f.seek(offset)
+                records.append(json.loads(f.readline()))
+        return records
+    
+    def _lookup(self, get_offsets):
+        """색인에서 줄 위치를 찾아 기록 읽기 (기록 대기 중인 내용을 먼저 반영)"""
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                self._unflushed = 0
+            if self._by_url is None:
+                self._build_index()
+            offsets = get_offsets()
+        
+        return self._read_at(offsets) if offsets else []
+    
+    def get_by_url(self, url):
+        """
+        URL로 기록 조회
+        
+        Args:
+            url (str): 이미지 URL
+        
+        Returns:
+            dict: 매니페스트 기록 (없으면 None)
+        """
+        records = self._lookup(lambda: [self._by_url[url]] if url in self._by_url else [])
+        return records[0] if records else None
+    
+    def find_by_hash(self, sha256):
+        """
+        SHA-256 해시로 기록 조회
+        
+        Args:
+            sha256 (str): 본문 SHA-256 해시 (16진수)
+        
+        Returns:
+            list: 같은 내용의 이미지 기록 리스트 (저장 순서)
+        """
+        return self._lookup(lambda: list(self._by_hash.get(sha256, ())))
+    
+    def __iter__(self):
+        """모든 기록을 저장 순서대로 반환"""
+        self.flush()
+        if not os.path.exists(self.file_path):
+            return
+        
+        with open(self.file_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                yield record
+    
+    def flush(self):
+        """기록 대기 중인 내용을 파일에 반영"""
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                self._unflushed = 0
+    
+    def close(self):
+        """매니페스트 파일 닫기"""
+        with self._lock:
+            if self._file is not None and not self._file.closed:
+                self._file.close()
+            self._file = None
+
+
+def print_record(record):
+    """매니페스트 기록 한 건 출력"""
+    size = f"{record['width']}x{record['height']}" if record.get("width") else "크기 알 수 없음"
+    print(f"{record['file']}: {size}, {record['bytes']} bytes, {record.get('content_type')}")
+    print(f"  URL: {record['url']}")
+    print(f"  페이지 위치: {record.get('page_start')}, HTTP {record.get('status')}, "
+          f"첫 바이트 {record.get('first_byte')}초, 전체 {record.get('latency')}초")
+    print(f"  SHA-256: {record.get('sha256')}")
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="다운로드 매니페스트 조회")
+    parser.add_argument("save_path", help="키워드 저장 폴더 (예: downloads/고양이)")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--url", help="이미지 URL로 조회")
+    group.add_argument("--sha256", help="본문 SHA-256 해시로 조회")
+    group.add_argument("--summary", action="store_true", help="전체 기록 요약")
+    args = parser.parse_args()
+    
+    manifest = Manifest(args.save_path)
+    try:
+        if args.url:
+            record = manifest.get_by_url(args.url)
+            records = [record] if record is not None else []
+        elif args.sha256:
+            records = manifest.find_by_hash(args.sha256)
+        else:
+            records = None
+        
+        if records is None:
+            count = 0
+            total_bytes = 0
+            content_types = {}
+            for record in manifest:
+                count += 1
+                total_bytes += record.get("bytes") or 0
+                content_type = record.get("content_type") or "알 수 없음"
+                content_types[content_type] = content_types.get(content_type, 0) + 1
+            print(f"{count}개 이미지, {total_bytes / 1024 / 1024:.1f}MB")
+            for content_type, type_count in sorted(content_types.items(), key=lambda item: -item[1]):
+                print(f"  {content_type}: {type_count}개")
+        elif not records:
+            print("일치하는 기록이 없습니다.")
+        else:
+            for record in records:
+                print_record(record)
+    finally:
+        manifest.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+페이지 안정화 대기
+고정된 sleep 대신 섬네일 수와 스크롤 높이가 더 이상 변하지 않으면 바로 진행합니다.
+"""
+
+import time
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+
+
+# 섬네일 수와 스크롤 높이를 한 번의 호출로 조회
+PAGE_STATE_JS = """
+return [
+    document.images.length,
+    document.body ? document.body.scrollHeight : 0
+];
+"""
+
+
+class PageStateSettled:
+    """WebDriverWait 조건: 페이지 상태가 settle_time 동안 변하지 않으면 참"""
+    
+    def __init__(self, settle_time=0.5):
+        """
+        Args:
+            settle_time (float): 상태가 유지되어야 하는 시간 (초)
+        """
+        self.settle_time = settle_time
+        self._last_state = None
+        self._changed_at = None
+    
+    def __call__(self, driver):
+        state = driver.execute_script(PAGE_STATE_JS)
+        now = time.monotonic()
+        
+        if state != self._last_state:
+            self._last_state = state
+            self._changed_at = now
+            return False
+        
+        return now - self._changed_at >= self.settle_time
+
+
+def wait_until_settled(driver, timeout=10, settle_time=0.5, poll_frequency=0.1,
+                       wait_for_images=False, stop_event=None):
+    """
+    페이지가 안정될 때까지 대기
+    
+    Args:
+        driver (WebDriver): 셀레니움 드라이버
+        timeout (float): 최대 대기 시간 (초)
+        settle_time (float): 섬네일 수와 스크롤 높이가 유지되어야 하는 시간 (초)
+        poll_frequency (float): 상태 확인 간격 (초)
+        wait_for_images (bool): 먼저 이미지 요소가 나타날 때까지 대기할지 여부
+        stop_event (threading.Event): 설정되면 안정되기를 기다리지 않고 바로 반환
+    
+    Returns:
+        float: 실제로 안정되기까지 걸린 시간 (초, 시간 초과 시 timeout)
+    """
+    started = time.monotonic()
+    wait = WebDriverWait(driver, timeout, poll_frequency=poll_frequency)
+    
+    def stoppable(condition):
+        if stop_event is None:
+            return condition
+        return lambda d: stop_event.is_set() or condition(d)
+    
+    try:
+        if wait_for_images:
+            wait.until(stoppable(EC.presence_of_element_located((By.TAG_NAME, "img"))))
+        
+        remaining = max(timeout - (time.monotonic() - started), poll_frequency)
+        WebDriverWait(driver, remaining, poll_frequency=poll_frequency).until(
+            stoppable(PageStateSettled(settle_time))
+        )
+    except TimeoutException:
+        pass
+    
+    return time.monotonic() - started
@@ -0,0 +1,409 @@
+"""
+지각 해시 기반 유사 이미지 검출
+크기 변경이나 재압축된 같은 사진을 aHash/dHash/pHash로 찾고,
+BK-트리로 해밍 거리 조회를 빠르게 처리합니다.
+
+사용법 (다운로드 폴더 전체에서 유사 이미지 찾기):
+    python3 perceptual.py downloads
+    python3 perceptual.py downloads --threshold 8 --hash phash
+    python3 perceptual.py downloads --remove   # 유사 이미지 삭제 (먼저 나온 파일 유지)
+"""
+
+import argparse
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from dedup import IMAGE_EXTENSIONS, _natural_key
+
+
+# 해시 크기 (8 → 64비트 해시)
+HASH_SIZE = 8
+
+# pHash에서 DCT를 적용할 축소 이미지 크기
+PHASH_IMAGE_SIZE = 32
+
+
+def _dct_matrix(size):
+    """DCT-II 변환 행렬 생성"""
+    n = np.arange(size)
+    matrix = np.cos(np.pi * (2 * n[None, :] + 1) * n[:, None] / (2 * size))
+    matrix[0] *= 1 / np.sqrt(2)
+    return matrix * np.sqrt(2 / size)
+
+
+_DCT_MATRIX = _dct_matrix(PHASH_IMAGE_SIZE)
+
+
+def _bits_to_int(bits):
+    """불리언 배열을 정수 해시로 변환"""
+    return int.from_bytes(np.packbits(bits.ravel()).tobytes(), "big")
+
+
+def load_grayscale(image, size):
+    """
+    이미지를 흑백으로 변환하고 size 크기로 축소한 배열 반환
+    
+    JPEG는 Image.draft로 디코딩 단계에서 미리 축소하므로 큰 이미지도 빠르게 읽습니다.
+    
+    Args:
+        image (Image.Image): PIL 이미지
+        size (tuple): (너비, 높이)
+    
+    Returns:
+        np.ndarray: float32 흑백 배열 (높이 × 너비)
+    """
+    image.draft("L", (size[0] * 4, size[1] * 4))
+    image = image.convert("L").resize(size, Image.BILINEAR)
+    return np.asarray(image, dtype=np.float32)
+
+
+def ahash(image, hash_size=HASH_SIZE):
+    """
+    평균 해시: 축소 이미지의 각 픽셀이 평균보다 밝은지 여부
+    
+    Args:
+        image (Image.Image): PIL 이미지
+        hash_size (int): 해시 한 변의 크기
+    
+    Returns:
+        int: hash_size² 비트 해시
+    """
+    pixels = load_grayscale(image, (hash_size, hash_size))
+    return _bits_to_int(pixels > pixels.mean())
+
+
+def dhash(image, hash_size=HASH_SIZE):
+    """
+    차이 해시: 가로로 이웃한 픽셀의 밝기 변화 방향
+    
+    Args:
+        image (Image.Image): PIL 이미지
+        hash_size (int): 해시 한 변의 크기
+    
+    Returns:
+        int: hash_size² 비트 해시
+    """
+    pixels = load_grayscale(image, (hash_size + 1, hash_size))
+    return _bits_to_int(pixels[:, 1:] > pixels[:, :-1])
+
+
+def phash(image, hash_size=HASH_SIZE):
+    """
+    DCT 해시: 저주파 DCT 계수가 중앙값보다 큰지 여부
+    
+    Args:
+        image (Image.Image): PIL 이미지
+        hash_size (int): 해시 한 변의 크기
+    
+    Returns:
+        int: hash_size² 비트 해시
+    """
+    pixels = load_grayscale(image, (PHASH_IMAGE_SIZE, PHASH_IMAGE_SIZE))
+    dct = _DCT_MATRIX @ pixels @ _DCT_MATRIX.T
+    low_freq = dct[:hash_size, :hash_size]
+    # DC 성분(평균 밝기)은 중앙값 계산에서 제외
+    median = np.median(low_freq.ravel()[1:])
+    return _bits_to_int(low_freq > median)
+
+
+HASH_FUNCTIONS = {
+    "ahash": ahash,
+    "dhash": dhash,
+    "phash": phash,
+}
+
+
+def hash_image_file(file_path, hash_kind="dhash"):
+    """
+    이미지 파일의 지각 해시 계산
+    
+    Args:
+        file_path (str): 이미지 파일 경로 또는 파일 객체
+        hash_kind (str): 해시 종류 ("ahash", "dhash", "phash")
+    
+    Returns:
+        int: 64비트 해시 (이미지를 읽을 수 없으면 None)
+    """
+    try:
+        with Image.open(file_path) as image:
+            return HASH_FUNCTIONS[hash_kind](image)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return None
+
+
+def hamming_distance(a, b):
+    """두 해시의 해밍 거리"""
+    return (a ^ b).bit_count()
+
+
+class BKTree:
+    """
+    해밍 거리 BK-트리
+    
+    각 노드의 자식을 부모와의 거리로 구분해 두어, 삼각 부등식으로 조회 시
+    대부분의 가지를 건너뜁니다. 작은 임계값 조회는 전체 비교보다 훨씬 적은
+    노드만 방문합니다.
+    """
+    
+    def __init__(self):
+        # 노드: [해시, 값, {거리: 자식 노드}]
+        self._root = None
+        self._size = 0
+    
+    def add(self, hash_value, value):
+        """
+        해시 추가
+        
+        Args:
+            hash_value (int): 지각 해시
+            value: 해시와 함께 저장할 값 (파일명 등)
+        """
+        self._size += 1
+        if self._root is None:
+            self._root = [hash_value, value, {}]
+            return
+        
+        node = self._root
+        while True:
+            distance = hamming_distance(hash_value, node[0])
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [hash_value, value, {}]
+                return
+            node = child
+    
+    def find(self, hash_value, threshold):
+        """
+        거리 threshold 이하의 해시를 모두 찾기
+        
+        Args:
+            hash_value (int): 찾을 해시
+            threshold (int): 최대 해밍 거리
+        
+        Returns:
+            list: (거리, 값) 리스트 (거리 순 정렬)
+        """
+        matches = []
+        if self._root is None:
+            return matches
+        
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            distance = hamming_distance(hash_value, node[0])
+            if distance <= threshold:
+                matches.append((distance, node[1]))
+            
+            for child_distance, child in node[2].items():
+                if distance - threshold <= child_distance <= distance + threshold:
+                    stack.append(child)
+        
+        matches.sort(key=lambda match: match[0])
+        return matches
+    
+    def __len__(self):
+        return self._size
+
+
+class PerceptualIndex:
+    """
+    저장 디렉토리별 지각 해시 인덱스
+    
+    디렉토리의 .perceptual_hashes.log에 "해시종류\\t16진수 해시\\t파일명"을 한 줄씩
+    추가합니다. 로그에 없는 기존 이미지는 처음 열 때 해시를 계산해 추가합니다.
+    """
+    
+    LOG_NAME = ".perceptual_hashes.log"
+    
+    def __init__(self, save_path, hash_kind="dhash", threshold=6):
+        """
+        인덱스 열기
+        
+        Args:
+            save_path (str): 이미지 저장 경로
+            hash_kind (str): 해시 종류 ("ahash", "dhash", "phash")
+            threshold (int): 유사 이미지로 볼 최대 해밍 거리 (64비트 기준)
+        """
+        self.save_path = save_path
+        self.hash_kind = hash_kind
+        self.threshold = threshold
+        self.file_path = os.path.join(save_path, self.LOG_NAME)
+        
+        self._lock = threading.Lock()
+        self._tree = BKTree()
+        
+        indexed = set()
+        if os.path.exists(self.file_path):
+            with open(self.file_path, encoding="utf-8") as f:
+                for line in f:
+                    kind, _, rest = line.rstrip("\n").partition("\t")
+                    hex_hash, _, filename = rest.partition("\t")
+                    if kind == hash_kind and filename:
+                        self._tree.add(int(hex_hash, 16), filename)
+                        indexed.add(filename)
+        
+        self._file = open(self.file_path, "a", encoding="utf-8")
+        
+        # 로그에 없는 기존 이미지 색인
+        missing = [
+            filename for filename in list_images(save_path)
+            if filename not in indexed
+        ]
+        for filename in missing:
+            hash_value = hash_image_file(os.path.join(save_path, filename), hash_kind)
+            if hash_value is not None:
+                self.add(hash_value, filename)
+        if missing:
+            print(f"지각 해시 색인: 기존 이미지 {len(missing)}개 추가")
+    
+    def hash_file(self, file_path):
+        """
+        이 인덱스의 해시 종류로 파일 해시 계산
+        
+        Args:
+            file_path (str): 이미지 파일 경로 또는 파일 객체
+        
+        Returns:
+            int: 지각 해시 (이미지를 읽을 수 없으면 None)
+        """
+        return hash_image_file(file_path, self.hash_kind)
+    
+    def find(self, hash_value):
+        """
+        유사 이미지 찾기
+        
+        Args:
+            hash_value (int): 지각 해시
+        
+        Returns:
+            str: 가장 가까운 기존 파일 경로 (없으면 None)
+        """
+        with self._lock:
+            matches = self._tree.find(hash_value, self.threshold)
+        if not matches:
+            return None
+        return os.path.join(self.save_path, matches[0][1])
+    
+    def add(self, hash_value, file_path):
+        """
+        저장한 파일의 해시 기록
+        
+        Args:
+            hash_value (int): 지각 해시
+            file_path (str): 저장한 파일 경로
+        """
+        filename = os.path.basename(file_path)
+        with self._lock:
+            self._tree.add(hash_value, filename)
+            self._file.write(f"{self.hash_kind}\t{hash_value:016x}\t{filename}\n")
+            self._file.flush()
+    
+    def __len__(self):
+        return len(self._tree)
+    
+    def close(self):
+        """인덱스 파일 닫기"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+def list_images(directory):
+    """
+    디렉토리의 이미지 파일명 목록 (숨김 파일 제외, 파일 번호 순)
+    
+    Args:
+        directory (str): 디렉토리 경로
+    
+    Returns:
+        list: 이미지 파일명 리스트
+    """
+    return sorted(
+        (
+            entry.name for entry in os.scandir(directory)
+            if entry.is_file()
+            and not entry.name.startswith(".")
+            and os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS
+        ),
+        key=_natural_key
+    )
+
+
+def find_near_duplicates(root_dir, hash_kind="dhash", threshold=6, workers=None):
+    """
+    다운로드 폴더 전체(모든 키워드 폴더)에서 유사 이미지 찾기
+    
+    해시 계산은 여러 프로세스로 나누어 처리하고, 파일 순서대로 BK-트리에
+    넣으면서 먼저 나온 비슷한 파일을 원본으로 봅니다.
+    
+    Args:
+        root_dir (str): 다운로드 루트 디렉토리
+        hash_kind (str): 해시 종류 ("ahash", "dhash", "phash")
+        threshold (int): 유사 이미지로 볼 최대 해밍 거리
+        workers (int): 해시 계산 프로세스 수 (None이면 CPU 수)
+    
+    Returns:
+        list: (유사 파일 경로, 원본 파일 경로, 거리) 리스트
+    """
+    file_paths = []
+    for directory, dirnames, _ in os.walk(root_dir):
+        # 숨김 폴더, 하드링크 중복 폴더와 섬네일 폴더는 제외
+        dirnames[:] = sorted(
+            name for name in dirnames
+            if not name.startswith(".") and name not in ("duplicates", "thumbnails")
+        )
+        file_paths.extend(os.path.join(directory, name) for name in list_images(directory))
+    
+    print(f"{len(file_paths)}개 이미지 해시 계산 중...")
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        hashes = list(executor.map(
+            hash_image_file,
+            file_paths,
+            [hash_kind] * len(file_paths),
+            chunksize=64
+        ))
+    
+    tree = BKTree()
+    duplicates = []
+    for file_path, hash_value in zip(file_paths, hashes):
+        if hash_value is None:
+            continue
+        
+        matches = tree.find(hash_value, threshold)
+        if matches:
+            distance, original_path = matches[0]
+            duplicates.append((file_path, original_path, distance))
+        else:
+            tree.add(hash_value, file_path)
+    
+    return duplicates
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="다운로드 폴더 유사 이미지 찾기")
+    parser.add_argument("root_dir", nargs="?", default="downloads", help="다운로드 루트 디렉토리")
+    parser.add_argument("--hash", dest="hash_kind", choices=sorted(HASH_FUNCTIONS), default="dhash",
+                        help="지각 해시 종류")
+    parser.add_argument("--threshold", type=int, default=6, help="유사 이미지로 볼 최대 해밍 거리 (0~64)")
+    parser.add_argument("--workers", type=int, help="해시 계산 프로세스 수")
+    parser.add_argument("--remove", action="store_true", help="유사 이미지 삭제")
+    args = parser.parse_args()
+    
+    duplicates = find_near_duplicates(args.root_dir, args.hash_kind, args.threshold, args.workers)
+    
+    for file_path, original_path, distance in duplicates:
+        action = "삭제" if args.remove else "유사"
+        print(f"{file_path} → {original_path} (거리 {distance}, {action})")
+        if args.remove:
+            os.remove(file_path)
+    
+    print(f"\n총 {len(duplicates)}개 유사 이미지")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+호스트별 요청 속도 제한
+호스트마다 토큰 버킷을 두어 초당 요청 수를 제한하고, 429/503 응답을 받으면
+Retry-After만큼 쉬고 속도를 줄였다가 성공 응답이 이어지면 다시 올립니다.
+"""
+
+import email.utils
+import threading
+import time
+from urllib.parse import urlparse
+
+
+# 속도를 줄여야 하는 응답 상태 코드
+THROTTLE_STATUSES = frozenset([429, 503])
+
+# 기본 호스트별 초당 요청 수 (도메인 접미사로 일치, Google 섬네일 CDN은 빠르게 받음)
+DEFAULT_HOST_RATES = {"gstatic.com": 50.0}
+
+
+def parse_retry_after(value):
+    """
+    Retry-After 헤더 값을 대기 시간으로 변환
+    
+    Args:
+        value (str): 초 단위 숫자 또는 HTTP 날짜
+    
+    Returns:
+        float: 대기 시간 (초, 값이 없거나 잘못되면 None)
+    """
+    if not value:
+        return None
+    
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+class TokenBucket:
+    """
+    호스트 하나의 토큰 버킷
+    
+    토큰을 미리 예약하는 방식이라 호출한 쪽은 돌려받은 시간만큼만 기다리면
+    되고, 잠금은 계산하는 동안만 잡습니다. 동시에 여러 스레드가 요청해도
+    순서대로 rate 간격으로 나뉘며, 쉬던 호스트는 burst개까지 바로 보낼 수 있습니다.
+    """
+    
+    def __init__(self, rate, burst):
+        """
+        Args:
+            rate (float): 초당 요청 수
+            burst (int): 쉬고 있던 호스트에 연속으로 보낼 수 있는 요청 수
+        """
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = max(int(burst), 1)
+        self._lock = threading.Lock()
+        # 다음 요청이 버킷을 비우지 않고 나갈 수 있는 이론상 시각
+        self._next_time = 0.0
+    
+    def reserve(self):
+        """
+        요청 하나를 예약
+        
+        Returns:
+            float: 요청을 보내기 전에 기다려야 하는 시간 (초)
+        """
+        with self._lock:
+            now = time.monotonic()
+            interval = 1.0 / self.rate
+            next_time = max(self._next_time, now)
+            start = max(next_time - (self.burst - 1) * interval, now)
+            self._next_time = next_time + interval
+            return start - now
+    
+    def slow_down(self, factor, min_rate, pause=None):
+        """
+        속도를 factor배로 줄이고 pause초 동안 요청을 멈춤
+        
+        Args:
+            factor (float): 속도 감소 비율 (0~1)
+            min_rate (float): 최소 초당 요청 수
+            pause (float): 멈출 시간 (None이면 줄어든 속도의 요청 간격)
+        """
+        with self._lock:
+            self.rate = max(self.rate * factor, min_rate)
+            interval = 1.0 / self.rate
+            if pause is None:
+                pause = interval
+            # 멈춘 뒤에는 버스트 없이 간격대로 보냄
+            resume_at = time.monotonic() + pause + (self.burst - 1) * interval
+            self._next_time = max(self._next_time, resume_at)
+    
+    def recover(self, step):
+        """
+        성공 응답마다 속도를 기본값 쪽으로 조금씩 회복
+        
+        Args:
+            step (float): 한 번에 늘릴 기본 속도 대비 비율
+        """
+        if self.rate >= self.base_rate:
+            return
+        with self._lock:
+            self.rate = min(self.rate + self.base_rate * step, self.base_rate)
+
+
+class HostRateLimiter:
+    """
+    호스트별 토큰 버킷 모음
+    
+    여러 크롤러(일괄 검색의 모든 키워드)가 하나를 공유하면 같은 호스트에 대한
+    요청이 키워드와 관계없이 함께 제한됩니다.
+    """
+    
+    def __init__(self, default_rate=10.0, host_rates=None, burst=None,
+                 min_rate=0.2, slowdown=0.5, recovery_step=0.05, max_pause=60.0):
+        """
+        속도 제한 초기화
+        
+        Args:
+            default_rate (float): 호스트별 기본 초당 요청 수
+            host_rates (dict): 호스트별 초당 요청 수 (None이면 DEFAULT_HOST_RATES,
+                "gstatic.com"처럼 도메인을 주면 하위 호스트에도 적용)
+            burst (int): 연속으로 보낼 수 있는 요청 수 (None이면 1초 분량)
+            min_rate (float): 429/503으로 줄일 수 있는 최소 초당 요청 수
+            slowdown (float): 429/503을 받을 때마다 곱할 속도 비율
+            recovery_step (float): 성공 응답마다 늘릴 기본 속도 대비 비율
+            max_pause (float): Retry-After로 호스트 요청을 멈출 최대 시간 (초,
+                서버가 더 길게 요구해도 이 시간이 지나면 다시 요청)
+        """
+        self.default_rate = default_rate
+        self.host_rates = DEFAULT_HOST_RATES if host_rates is None else host_rates
+        self.burst = burst
+        self.min_rate = min_rate
+        self.slowdown = slowdown
+        self.recovery_step = recovery_step
+        self.max_pause = max_pause
+        
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._throttled = {}
+    
+    def _rate_for(self, host):
+        """호스트의 설정 속도 (정확히 일치하는 호스트, 상위 도메인 순으로 확인)"""
+        parts = host.split(".")
+        for i in range(len(parts)):
+            rate = self.host_rates.get(".".join(parts[i:]))
+            if rate is not None:
+                return rate
+        return self.default_rate
+    
+    def _bucket(self, url):
+        """URL 호스트의 토큰 버킷 (처음 요청 시 생성)"""
+        host = urlparse(url).hostname or ""
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(host)
+                if bucket is None:
+                    rate = self._rate_for(host)
+                    bucket = TokenBucket(rate, self.burst or max(rate, 1))
+                    self._buckets[host] = bucket
+        return bucket
+    
+    def reserve(self, url):
+        """
+        요청 하나를 예약하고 기다려야 하는 시간 반환 (asyncio에서 사용)
+        
+        Args:
+            url (str): 요청할 URL
+        
+        Returns:
+            float: 대기 시간 (초)
+        """
+        return self._bucket(url).reserve()
+    
+    def acquire(self, url, cancel_event=None, deadline=None):
+        """
+        요청을 보낼 차례가 될 때까지 대기
+        
+        Args:
+            url (str): 요청할 URL
+            cancel_event (threading.Event): 설정되면 대기를 멈춤
+            deadline (float): 차례가 이 시각(time.monotonic() 기준) 뒤라면 기다리지 않음
+        
+        Returns:
+            bool: 요청을 보내도 되면 True (대기 중 취소되었거나 차례가 deadline 뒤면 False)
+        """
+        delay = self.reserve(url)
+        if deadline is not None and time.monotonic() + delay > deadline:
+            return False
+        if delay > 0:
+            if cancel_event is not None:
+                return not cancel_event.wait(delay)
+            time.sleep(delay)
+        return True
+    
+    def observe(self, url, status, retry_after=None):
+        """
+        응답 상태 반영 (429/503이면 감속, 성공이면 회복)
+        
+        Args:
+            url (str): 요청한 URL
+            status (int): HTTP 상태 코드
+            retry_after (str): Retry-After 헤더 값 (선택)
+        """
+        bucket = self._bucket(url)
+        
+        if status in THROTTLE_STATUSES:
+            pause = parse_retry_after(retry_after)
+            if pause is not None:
+                pause = min(pause, self.max_pause)
+            bucket.slow_down(self.slowdown, self.min_rate, pause)
+            host = urlparse(url).hostname or ""
+            with self._lock:
+                self._throttled[host] = self._throttled.get(host, 0) + 1
+        elif status < 400:
+            bucket.recover(self.recovery_step)
+    
+    def summary(self):
+        """
+        감속 통계
+        
+        Returns:
+            tuple: (429/503 응답 수, 감속한 호스트 수)
+        """
+        with self._lock:
+            return sum(self._throttled.values()), len(self._throttled)
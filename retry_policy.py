@@ -0,0 +1,278 @@
+"""
+다운로드 재시도 정책과 호스트별 회로 차단기
+다시 시도하면 성공할 수 있는 오류(연결 오류, 타임아웃, 5xx, 429)만 지터를 준 지수
+백오프로 재시도하고, 연속으로 실패하는 호스트는 잠시 요청 대상에서 제외합니다.
+"""
+
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+
+
+# 재시도할 HTTP 상태 코드
+RETRYABLE_STATUSES = frozenset([408, 425, 429, 500, 502, 503, 504])
+
+# 다시 시도해도 같은 결과인 연결 오류 (인증서 오류 등)
+_FATAL_CONNECTION_ERRORS = (requests.exceptions.SSLError, requests.exceptions.InvalidURL)
+
+# 연결 단계나 본문을 받는 중에 끊긴 오류
+_TRANSIENT_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+    ConnectionError,
+    TimeoutError
+)
+
+
+class DeadlineExceededError(TimeoutError):
+    """
+    다운로드 한 건이 정해진 제한 시간을 넘은 경우
+    
+    조금씩 보내며 시간을 끄는 호스트이므로 호스트 장애로 기록하지만,
+    다시 받아도 같은 결과일 가능성이 높아 재시도하지 않습니다.
+    """
+
+
+def error_status(error):
+    """
+    오류에 담긴 HTTP 상태 코드
+    
+    Args:
+        error (Exception): 다운로드 중 발생한 오류
+    
+    Returns:
+        int: 상태 코드 (HTTP 오류가 아니면 None)
+    """
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None)
+
+
+class RetryPolicy:
+    """재시도 가능 여부 판단과 지터를 준 지수 백오프"""
+    
+    def __init__(self, max_retries=3, base_delay=0.5, max_delay=10.0):
+        """
+        Args:
+            max_retries (int): 첫 요청 이후 최대 재시도 횟수
+            base_delay (float): 첫 재시도 전 최대 대기 시간 (초, 재시도마다 두 배)
+            max_delay (float): 재시도 전 대기 시간 상한 (초)
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+    
+    @staticmethod
+    def is_retryable(error):
+        """
+        다시 시도하면 성공할 수 있는 오류인지 확인
+        
+        Args:
+            error (Exception): 다운로드 중 발생한 오류
+        
+        Returns:
+            bool: 연결 오류, 타임아웃, 일시적 HTTP 오류(5xx, 408, 429)면 True
+                (404 같은 클라이언트 오류, 이미지가 아닌 응답, 크기 초과,
+                다운로드 제한 시간 초과는 False)
+        """
+        status = error_status(error)
+        if status is not None:
+            return status in RETRYABLE_STATUSES
+        if isinstance(error, (_FATAL_CONNECTION_ERRORS, DeadlineExceededError)):
+            return False
+        return isinstance(error, _TRANSIENT_ERRORS)
+    
+    @staticmethod
+    def is_host_failure(error):
+        """
+        호스트 장애로 볼 오류인지 확인 (회로 차단기에 기록)
+        
+        호스트가 응답은 했지만 요청이 잘못된 경우(404, 이미지가 아닌 응답 등)와
+        속도 제한(429)은 호스트 장애가 아닙니다.
+        
+        Args:
+            error (Exception): 다운로드 중 발생한 오류
+        
+        Returns:
+            bool: 연결 실패, 타임아웃(다운로드 제한 시간 초과 포함), 5xx 응답이면 True
+        """
+        status = error_status(error)
+        if status is not None:
+            return status >= 500
+        return isinstance(error, _TRANSIENT_ERRORS)
+    
+    def backoff(self, attempt):
+        """
+        재시도 전 대기 시간 (전체 지터: 0부터 지수적으로 늘어나는 상한 사이의 임의 값)
+        
+        여러 작업 스레드가 같은 호스트에서 동시에 실패해도 재시도 시점이 흩어집니다.
+        
+        Args:
+            attempt (int): 지금까지 실패한 횟수 - 1 (첫 재시도면 0)
+        
+        Returns:
+            float: 대기 시간 (초)
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class _HostCircuit:
+    """호스트 하나의 회로 상태"""
+    
+    def __init__(self, reset_timeout):
+        self.state = CircuitBreaker.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.reset_timeout = reset_timeout
+        self.probing = False
+
+
+class CircuitBreaker:
+    """
+    호스트별 회로 차단기
+    
+    한 호스트에서 failure_threshold번 연속으로 장애가 나면 회로를 열어(open)
+    reset_timeout 동안 그 호스트의 URL을 요청하지 않습니다. 시간이 지나면
+    반쯤 열린(half-open) 상태에서 요청 하나만 시험 삼아 보내고, 성공하면 다시
+    닫고(closed) 실패하면 대기 시간을 두 배로 늘려 다시 엽니다.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, max_reset_timeout=600.0):
+        """
+        Args:
+            failure_threshold (int): 회로를 열기까지의 연속 장애 횟수
+            reset_timeout (float): 회로를 연 뒤 시험 요청을 보내기까지의 시간 (초)
+            max_reset_timeout (float): 시험 요청이 계속 실패할 때 늘어나는 대기 시간 상한 (초)
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        
+        self._lock = threading.Lock()
+        self._hosts = {}
+        self._skipped = 0
+    
+    def _circuit(self, url):
+        """URL 호스트의 회로 (처음 요청 시 생성, 잠금을 잡은 상태에서 호출)"""
+        host = urlparse(url).hostname or ""
+        circuit = self._hosts.get(host)
+        if circuit is None:
+            circuit = _HostCircuit(self.reset_timeout)
+            self._hosts[host] = circuit
+        return circuit
+    
+    def _blocked(self, circuit):
+        """요청을 보낼 수 없는 상태인지 확인"""
+        if circuit.state == self.OPEN:
+            return time.monotonic() - circuit.opened_at < circuit.reset_timeout
+        return circuit.state == self.HALF_OPEN and circuit.probing
+    
+    def should_skip(self, url):
+        """
+        작업을 제출하기 전에 호스트 회로가 열려 있는지 확인 (건너뛴 수 집계)
+        
+        Args:
+            url (str): 이미지 URL
+        
+        Returns:
+            bool: 회로가 열려 있어 요청하지 않아야 하면 True
+        """
+        with self._lock:
+            if self._blocked(self._circuit(url)):
+                self._skipped += 1
+                return True
+            return False
+    
+    def allow(self, url):
+        """
+        요청 직전 확인 (대기 시간이 지난 열린 회로는 시험 요청 하나만 허용)
+        
+        Args:
+            url (str): 이미지 URL
+        
+        Returns:
+            bool: 요청을 보내도 되면 True
+        """
+        with self._lock:
+            circuit = self._circuit(url)
+            if self._blocked(circuit):
+                return False
+            if circuit.state == self.OPEN:
+                circuit.state = self.HALF_OPEN
+            if circuit.state == self.HALF_OPEN:
+                circuit.probing = True
+            return True
+    
+    def record_success(self, url):
+        """
+        호스트가 정상 응답한 경우 기록 (회로를 닫음)
+        
+        Args:
+            url (str): 이미지 URL
+        """
+        with self._lock:
+            circuit = self._circuit(url)
+            if circuit.state != self.CLOSED:
+                print(f"호스트 복구: {urlparse(url).hostname}")
+            circuit.state = self.CLOSED
+            circuit.failures = 0
+            circuit.probing = False
+            circuit.reset_timeout = self.reset_timeout
+    
+    def release(self, url):
+        """
+        성공도 실패도 아닌 채로 끝난 요청 반납 (취소 등)
+        
+        시험 요청이었다면 회로를 열린 상태로 되돌립니다. 대기 시간은 이미 지났으므로
+        다음 요청이 바로 다시 시험할 수 있습니다.
+        
+        Args:
+            url (str): 이미지 URL
+        """
+        with self._lock:
+            circuit = self._circuit(url)
+            if circuit.state == self.HALF_OPEN and circuit.probing:
+                circuit.state = self.OPEN
+                circuit.probing = False
+    
+    def record_failure(self, url):
+        """
+        호스트 장애 기록 (연속 장애가 기준을 넘거나 시험 요청이 실패하면 회로를 엶)
+        
+        Args:
+            url (str): 이미지 URL
+        """
+        with self._lock:
+            circuit = self._circuit(url)
+            circuit.failures += 1
+            
+            if circuit.state == self.HALF_OPEN:
+                circuit.reset_timeout = min(circuit.reset_timeout * 2, self.max_reset_timeout)
+            elif circuit.state == self.OPEN or circuit.failures < self.failure_threshold:
+                return
+            
+            circuit.state = self.OPEN
+            circuit.opened_at = time.monotonic()
+            circuit.probing = False
+            print(
+                f"호스트 차단: {urlparse(url).hostname} "
+                f"(연속 실패 {circuit.failures}회, {circuit.reset_timeout:.0f}초 후 다시 확인)"
+            )
+    
+    def summary(self):
+        """
+        회로 차단 통계
+        
+        Returns:
+            tuple: (현재 열린 회로 수, 회로가 열려 건너뛴 URL 수)
+        """
+        with self._lock:
+            open_hosts = sum(1 for circuit in self._hosts.values() if circuit.state != self.CLOSED)
+            return open_hosts, self._skipped
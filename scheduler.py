@@ -0,0 +1,217 @@
+"""
+다중 키워드 병렬 스케줄러
+여러 키워드를 작업 스레드마다 별도 브라우저로 동시에 크롤링합니다.
+
+사용법:
+    python3 scheduler.py keywords.txt --concurrency 8 --num-images 50
+"""
+
+import argparse
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from dedup import UrlIndex
+from downloader import DownloadBudget, HostLimiter
+from driver_pool import DriverPool
+from http_client import HttpClient
+from rate_limiter import HostRateLimiter
+from retry_policy import CircuitBreaker
+
+
+# 키워드별 실행 결과 (error는 실패 시 오류 메시지)
+KeywordResult = namedtuple("KeywordResult", ["keyword", "downloaded", "elapsed", "error"])
+
+
+def load_keywords(file_path):
+    """
+    키워드 파일 읽기 (한 줄에 하나, 빈 줄과 #으로 시작하는 줄은 무시)
+    
+    Args:
+        file_path (str): 키워드 파일 경로
+    
+    Returns:
+        list: 중복을 제거한 키워드 리스트 (파일 순서 유지)
+    """
+    keywords = []
+    seen = set()
+    with open(file_path, encoding="utf-8") as f:
+        for line in f:
+            keyword = line.strip()
+            if keyword and not keyword.startswith("#") and keyword not in seen:
+                keywords.append(keyword)
+                seen.add(keyword)
+    return keywords
+
+
+class BatchScheduler:
+    """여러 키워드를 동시에 크롤링하는 스케줄러"""
+    
+    def __init__(self, concurrency=4, headless=True, download_budget=64,
+                 max_workers_per_keyword=8, max_pages_per_driver=50, rate_limit=10.0,
+                 host_rates=None, per_host_limit=4):
+        """
+        스케줄러 초기화
+        
+        Args:
+            concurrency (int): 동시에 실행할 키워드 수 (= 브라우저 수)
+            headless (bool): 브라우저 헤드리스 모드 여부
+            download_budget (int): 모든 키워드를 합친 최대 동시 다운로드 수
+            max_workers_per_keyword (int): 키워드 하나의 다운로드 스레드 수
+            max_pages_per_driver (int): 브라우저를 새로 띄우기 전까지 로드할 페이지 수
+            rate_limit (float): 모든 키워드를 합친 호스트별 기본 초당 요청 수
+            host_rates (dict): 호스트별 초당 요청 수 (None이면 기본 설정)
+            per_host_limit (int): 모든 키워드를 합친 호스트별 최대 동시 다운로드 수
+        """
+        self.concurrency = concurrency
+        self.max_workers_per_keyword = max_workers_per_keyword
+        
+        self.driver_pool = DriverPool(
+            size=concurrency,
+            headless=headless,
+            max_pages_per_driver=max_pages_per_driver
+        )
+        self.http_client = HttpClient(pool_size=download_budget)
+        self.budget = DownloadBudget(download_budget)
+        # 같은 호스트에 동시에 보내는 요청 수도 키워드와 관계없이 함께 제한
+        self.host_limiter = HostLimiter(per_host_limit)
+        # 같은 호스트에 대한 요청은 키워드와 관계없이 함께 제한
+        self.rate_limiter = HostRateLimiter(rate_limit, host_rates)
+        # 한 키워드에서 장애로 판명된 호스트는 다른 키워드에서도 요청하지 않음
+        self.circuit_breaker = CircuitBreaker()
+        # 저장 디렉토리별 URL 인덱스 (모든 키워드가 한 번 읽은 인덱스를 공유)
+        self._url_indexes = {}
+    
+    def get_url_index(self, save_dir):
+        """
+        저장 디렉토리의 URL 인덱스 반환 (처음 요청 시 한 번만 읽음)
+        
+        Args:
+            save_dir (str): 저장 디렉토리
+        
+        Returns:
+            UrlIndex: 모든 키워드가 공유하는 URL 인덱스
+        """
+        index_path = os.path.abspath(os.path.join(save_dir, ".url_index.log"))
+        if index_path not in self._url_indexes:
+            self._url_indexes[index_path] = UrlIndex(index_path)
+        return self._url_indexes[index_path]
+    
+    def _crawl_keyword(self, keyword, num_images, save_dir, time_limit=None, url_index=None):
+        """작업 스레드: 키워드 하나 크롤링"""
+        started = time.perf_counter()
+        
+        try:
+            with self.driver_pool.crawler(
+                http_client=self.http_client,
+                download_budget=self.budget,
+                host_limiter=self.host_limiter,
+                rate_limiter=self.rate_limiter,
+                circuit_breaker=self.circuit_breaker,
+                url_index=url_index,
+                max_workers=self.max_workers_per_keyword
+            ) as crawler:
+                downloaded = crawler.crawl_images(keyword, num_images, save_dir, time_limit=time_limit)
+            return KeywordResult(keyword, downloaded, time.perf_counter() - started, None)
+        
+        except Exception as e:
+            return KeywordResult(keyword, 0, time.perf_counter() - started, str(e))
+    
+    def run(self, keywords, num_images=50, save_dir="downloads", on_result=None, time_limit=None):
+        """
+        키워드 목록 크롤링
+        
+        Args:
+            keywords (list): 검색 키워드 리스트
+            num_images (int): 키워드당 다운로드할 이미지 개수
+            save_dir (str): 저장 디렉토리
+            on_result (callable): 키워드가 끝날 때마다 KeywordResult를 받아 호출할 함수
+            time_limit (float): 키워드당 제한 시간 (초, 지나면 그때까지 받은 이미지만 저장)
+        
+        Returns:
+            dict: {키워드: KeywordResult}
+        """
+        results = {}
+        
+        # 동시에 실행 중인 키워드가 받은 URL도 바로 보이도록 인덱스 하나를 공유
+        url_index = self.get_url_index(save_dir)
+        
+        # 브라우저를 미리 병렬로 띄워 첫 키워드들의 대기 시간을 줄임
+        self.driver_pool.warm_up(min(self.concurrency, len(keywords)))
+        
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="keyword") as executor:
+            futures = [
+                executor.submit(self._crawl_keyword, keyword, num_images, save_dir, time_limit, url_index)
+                for keyword in keywords
+            ]
+            
+            for future in as_completed(futures):
+                result = future.result()
+                results[result.keyword] = result
+                if on_result is not None:
+                    on_result(result)
+        
+        return results
+    
+    def close(self):
+        """브라우저, HTTP 세션 및 URL 인덱스 종료"""
+        self.driver_pool.close()
+        self.http_client.close()
+        for url_index in self._url_indexes.values():
+            url_index.close()
+        self._url_indexes.clear()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def print_summary(results, elapsed):
+    """키워드별 결과 요약 출력"""
+    print(f"\n{'=' * 50}")
+    print("일괄 크롤링 결과")
+    print(f"{'=' * 50}")
+    
+    total = 0
+    for result in results.values():
+        total += result.downloaded
+        status = f"❌ {result.error}" if result.error else "✅"
+        print(f"{result.keyword}: {result.downloaded}개 ({result.elapsed:.1f}초) {status}")
+    
+    print(f"\n총 {len(results)}개 키워드, {total}개 이미지, {elapsed:.1f}초")
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="여러 키워드 병렬 크롤링")
+    parser.add_argument("keywords_file", help="키워드 파일 (한 줄에 하나)")
+    parser.add_argument("--concurrency", type=int, default=os.cpu_count() or 4,
+                        help="동시에 실행할 키워드(브라우저) 수")
+    parser.add_argument("--num-images", type=int, default=50, help="키워드당 이미지 개수")
+    parser.add_argument("--save-dir", default="downloads", help="저장 디렉토리")
+    parser.add_argument("--download-budget", type=int, default=64, help="전체 동시 다운로드 수")
+    parser.add_argument("--rate-limit", type=float, default=10.0, help="호스트별 초당 요청 수")
+    parser.add_argument("--per-host-limit", type=int, default=4, help="호스트별 동시 다운로드 수")
+    parser.add_argument("--time-limit", type=float, help="키워드당 제한 시간 (초)")
+    args = parser.parse_args()
+    
+    keywords = load_keywords(args.keywords_file)
+    print(f"{len(keywords)}개 키워드, 동시 실행 {args.concurrency}개")
+    
+    started = time.perf_counter()
+    with BatchScheduler(
+        concurrency=args.concurrency,
+        download_budget=args.download_budget,
+        rate_limit=args.rate_limit,
+        per_host_limit=args.per_host_limit
+    ) as scheduler:
+        results = scheduler.run(keywords, args.num_images, args.save_dir, time_limit=args.time_limit)
+    
+    print_summary(results, time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    main()
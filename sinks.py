@@ -0,0 +1,503 @@
+"""
+다운로드 저장 대상
+받은 이미지를 파일(기본), 메모리 버퍼 또는 tar 샤드 묶음으로 저장합니다.
+"""
+
+import io
+import mmap
+import os
+import re
+import tarfile
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+
+# 샤드 색인 항목 (offset은 tar 파일 안에서 이미지 데이터가 시작하는 위치)
+ShardEntry = namedtuple("ShardEntry", ["name", "offset", "length", "sha256", "url"])
+
+# 샤드 파일명 형식
+SHARD_NAME_PATTERN = re.compile(r"^shard-(\d+)\.tar$")
+
+
+class FileSink:
+    """
+    파일 시스템 저장 (기본)
+    
+    임시 파일(.part)에 기록한 뒤 성공한 경우에만 최종 파일명으로 원자적으로
+    이름을 바꾸므로 불완전한 파일이 남지 않습니다.
+    """
+    
+    on_disk = True
+    
+    @contextmanager
+    def open(self, file_path, size_hint=None):
+        """
+        쓰기용 파일 열기 (블록이 정상 종료되면 file_path로 저장)
+        
+        Args:
+            file_path (str): 저장할 파일 경로
+            size_hint (int): 예상 크기 (파일 저장에서는 사용하지 않음)
+        
+        Yields:
+            file: 쓰기용 파일 객체
+        """
+        temp_path = file_path + ".part"
+        try:
+            with open(temp_path, 'wb') as f:
+                yield f
+            os.replace(temp_path, file_path)
+        
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+    
+    def commit(self, staging_path, file_path, result=None):
+        """
+        임시 이름으로 저장한 이미지를 최종 이름으로 확정
+        
+        Args:
+            staging_path (str): 임시 파일 경로
+            file_path (str): 최종 파일 경로
+            result (ImageResult): 다운로드 결과 (파일 저장에서는 사용하지 않음)
+        
+        Returns:
+            None: 파일 저장은 데이터를 따로 반환하지 않음
+        """
+        os.replace(staging_path, file_path)
+        return None
+    
+    def discard(self, file_path):
+        """저장한 이미지 삭제 (없으면 무시)"""
+        if os.path.exists(file_path):
+            os.remove(file_path)
+    
+    def reader(self, file_path):
+        """이미지를 읽을 수 있는 경로 또는 파일 객체 반환"""
+        return file_path
+    
+    def release(self, file_path):
+        """사용이 끝난 이미지 반납 (파일 저장에서는 할 일 없음)"""
+    
+    def has_capacity(self):
+        """새 다운로드를 시작할 여유가 있는지 여부"""
+        return True
+    
+    def wait_for_capacity(self, timeout=None):
+        """여유가 생길 때까지 대기"""
+        return True
+    
+    def names(self, save_path):
+        """
+        저장 경로에 저장된 이미지 이름 목록
+        
+        Args:
+            save_path (str): 이미지 저장 경로
+        
+        Returns:
+            list: 파일명 리스트
+        """
+        return [entry.name for entry in os.scandir(save_path) if entry.is_file()]
+    
+    def close(self):
+        """저장 대상 종료 (파일 저장에서는 할 일 없음)"""
+
+
+class _MemoryWriter:
+    """bytearray에 청크를 이어 쓰는 쓰기 객체"""
+    
+    def __init__(self, size_hint=None):
+        # 크기를 알면 한 번에 할당하여 재할당 복사를 피함
+        self.buffer = bytearray(size_hint or 0)
+        self.size = 0
+    
+    def write(self, chunk):
+        end = self.size + len(chunk)
+        if end <= len(self.buffer):
+            memoryview(self.buffer)[self.size:end] = chunk
+        else:
+            del self.buffer[self.size:]
+            self.buffer += chunk
+        self.size = end
+        return len(chunk)
+    
+    def finish(self):
+        """실제 받은 크기에 맞게 버퍼 정리"""
+        del self.buffer[self.size:]
+        return self.buffer
+
+
+class MemorySink:
+    """
+    메모리 저장
+    
+    이미지를 디스크에 쓰지 않고 bytearray에 받아 memoryview로 넘겨줍니다.
+    넘겨준 버퍼는 release()로 반납할 때까지 예산(max_bytes)에 포함되며,
+    예산을 넘으면 반납될 때까지 새 다운로드를 시작하지 않습니다.
+    """
+    
+    on_disk = False
+    
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        """
+        메모리 저장소 초기화
+        
+        Args:
+            max_bytes (int): 보관 중인 이미지 버퍼의 최대 총 크기
+        """
+        self.max_bytes = max_bytes
+        
+        self._condition = threading.Condition()
+        self._buffers = {}
+        self._used_bytes = 0
+    
+    @property
+    def used_bytes(self):
+        """보관 중인 버퍼 총 크기"""
+        return self._used_bytes
+    
+    @contextmanager
+    def open(self, file_path, size_hint=None):
+        """
+        쓰기용 버퍼 열기 (블록이 정상 종료되면 file_path 이름으로 보관)
+        
+        Args:
+            file_path (str): 이미지 이름 (파일 경로 형식)
+            size_hint (int): 예상 크기 (Content-Length)
+        
+        Yields:
+            _MemoryWriter: write(chunk)를 제공하는 쓰기 객체
+        """
+        writer = _MemoryWriter(size_hint)
+        yield writer
+        
+        buffer = writer.finish()
+        with self._condition:
+            self._buffers[file_path] = buffer
+            self._used_bytes += len(buffer)
+    
+    def commit(self, staging_path, file_path, result=None):
+        """
+        임시 이름으로 받은 버퍼를 최종 이름으로 확정
+        
+        Args:
+            staging_path (str): 임시 버퍼 이름
+            file_path (str): 최종 버퍼 이름
+            result (ImageResult): 다운로드 결과 (메모리 저장에서는 사용하지 않음)
+        
+        Returns:
+            memoryview: 이미지 데이터 (복사 없이 버퍼를 그대로 참조)
+        """
+        with self._condition:
+            buffer = self._buffers.pop(staging_path)
+            self._buffers[file_path] = buffer
+        return memoryview(buffer)
+    
+    def discard(self, file_path):
+        """버퍼 삭제 (없으면 무시)"""
+        self.release(file_path)
+    
+    def reader(self, file_path):
+        """버퍼를 파일처럼 읽는 객체 반환"""
+        with self._condition:
+            buffer = self._buffers[file_path]
+        return io.BytesIO(buffer)
+    
+    def release(self, file_path):
+        """
+        사용이 끝난 버퍼 반납 (예산에서 제외)
+        
+        Args:
+            file_path (str): 이미지 이름 (ImageResult.path)
+        """
+        with self._condition:
+            buffer = self._buffers.pop(file_path, None)
+            if buffer is not None:
+                self._used_bytes -= len(buffer)
+                self._condition.notify_all()
+    
+    def has_capacity(self):
+        """새 다운로드를 시작할 여유가 있는지 여부"""
+        return self._used_bytes < self.max_bytes
+    
+    def wait_for_capacity(self, timeout=None):
+        """
+        보관 중인 버퍼가 반납되어 예산에 여유가 생길 때까지 대기
+        
+        Args:
+            timeout (float): 최대 대기 시간 (초)
+        
+        Returns:
+            bool: 여유가 생겼으면 True
+        """
+        with self._condition:
+            return self._condition.wait_for(self.has_capacity, timeout)
+    
+    def names(self, save_path):
+        """메모리 저장은 실행 간에 남는 이미지가 없으므로 빈 리스트"""
+        return []
+    
+    def close(self):
+        """보관 중인 버퍼 모두 반납"""
+        with self._condition:
+            self._buffers.clear()
+            self._used_bytes = 0
+            self._condition.notify_all()
+
+
+class _ShardWriter:
+    """디렉토리 하나의 샤드 파일에 이미지를 순서대로 추가하는 쓰기 객체"""
+    
+    def __init__(self, directory, max_shard_bytes):
+        self.directory = directory
+        self.max_shard_bytes = max_shard_bytes
+        self.lock = threading.Lock()
+        
+        # 이전 실행의 샤드는 그대로 두고 다음 번호부터 새로 만듦
+        numbers = [
+            int(match.group(1)) for match in map(SHARD_NAME_PATTERN.match, os.listdir(directory))
+            if match
+        ]
+        self.shard_number = max(numbers, default=-1)
+        self.tar = None
+        self.index = None
+    
+    def _roll(self):
+        """현재 샤드를 닫고 다음 샤드 열기"""
+        self.close()
+        self.shard_number += 1
+        shard_path = os.path.join(self.directory, f"shard-{self.shard_number:05d}.tar")
+        self.tar = tarfile.open(shard_path, "w", format=tarfile.PAX_FORMAT)
+        self.index = open(shard_path + ShardSink.INDEX_SUFFIX, "w", encoding="utf-8")
+    
+    def append(self, name, buffer, url="", sha256=""):
+        """
+        이미지를 샤드 끝에 추가하고 색인 기록
+        
+        Returns:
+            ShardEntry: 추가한 이미지의 색인 항목
+        """
+        with self.lock:
+            if self.tar is None or (self.tar.offset > 0
+                                    and self.tar.offset + len(buffer) > self.max_shard_bytes):
+                self._roll()
+            
+            info = tarfile.TarInfo(name)
+            info.size = len(buffer)
+            info.mtime = int(time.time())
+            self.tar.addfile(info, io.BytesIO(buffer))
+            
+            # 데이터는 헤더 바로 뒤에 있고, 끝은 512바이트 블록 단위로 채워짐
+            padded_size = -(-len(buffer) // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+            entry = ShardEntry(name, self.tar.offset - padded_size, len(buffer), sha256 or "", url or "")
+            self.index.write("\t".join(str(field) for field in entry) + "\n")
+            
+            # 중간에 종료되어도 색인에 기록된 항목은 읽을 수 있도록 바로 반영
+            self.tar.fileobj.flush()
+            self.index.flush()
+            return entry
+    
+    def close(self):
+        """현재 샤드 닫기 (tar 종료 블록 기록)"""
+        if self.tar is not None:
+            self.tar.close()
+            self.index.close()
+            self.tar = None
+            self.index = None
+
+
+class ShardSink(MemorySink):
+    """
+    tar 샤드 저장
+    
+    이미지마다 파일을 만드는 대신 저장 경로의 shard-00000.tar, shard-00001.tar ...에
+    순서대로 이어 붙이고, 샤드마다 색인 파일(.idx)에 "이름, 데이터 위치, 길이,
+    SHA-256, URL"을 기록합니다. 다운로드 중인 이미지는 메모리에 받았다가 번호가
+    정해지면 샤드에 추가하므로 디스크 쓰기는 항상 순차적입니다.
+    저장한 이미지는 ShardReader로 색인의 위치를 이용해 바로 읽을 수 있습니다.
+    """
+    
+    INDEX_SUFFIX = ".idx"
+    
+    def __init__(self, max_shard_bytes=1024 * 1024 * 1024, max_bytes=256 * 1024 * 1024):
+        """
+        샤드 저장소 초기화
+        
+        Args:
+            max_shard_bytes (int): 샤드 파일 하나의 최대 크기 (넘으면 새 샤드 생성)
+            max_bytes (int): 샤드에 쓰기 전 메모리에 보관할 최대 총 크기
+        """
+        super().__init__(max_bytes)
+        self.max_shard_bytes = max_shard_bytes
+        
+        self._writers_lock = threading.Lock()
+        self._writers = {}
+    
+    def _get_writer(self, directory):
+        """디렉토리의 샤드 쓰기 객체 반환"""
+        directory = os.path.abspath(directory)
+        with self._writers_lock:
+            if directory not in self._writers:
+                self._writers[directory] = _ShardWriter(directory, self.max_shard_bytes)
+            return self._writers[directory]
+    
+    def commit(self, staging_path, file_path, result=None):
+        """
+        임시 이름으로 받은 버퍼를 샤드에 추가
+        
+        Args:
+            staging_path (str): 임시 버퍼 이름
+            file_path (str): 최종 이미지 이름 (디렉토리가 샤드 위치, 파일명이 항목 이름)
+            result (ImageResult): 다운로드 결과 (URL과 해시를 색인에 기록)
+        
+        Returns:
+            None: 데이터는 샤드에 저장되므로 따로 반환하지 않음
+        """
+        with self._condition:
+            buffer = self._buffers.pop(staging_path)
+        
+        try:
+            self._get_writer(os.path.dirname(file_path)).append(
+                os.path.basename(file_path),
+                buffer,
+                url=result.url if result is not None else "",
+                sha256=result.sha256 if result is not None else ""
+            )
+        finally:
+            with self._condition:
+                self._used_bytes -= len(buffer)
+                self._condition.notify_all()
+        
+        return None
+    
+    def names(self, save_path):
+        """
+        저장 경로의 샤드 색인에 기록된 이미지 이름 목록
+        
+        Args:
+            save_path (str): 이미지 저장 경로
+        
+        Returns:
+            list: 이미지 이름 리스트
+        """
+        return [entry.name for entry in iter_shard_entries(save_path)]
+    
+    def close(self):
+        """모든 샤드 닫기"""
+        with self._writers_lock:
+            for writer in self._writers.values():
+                with writer.lock:
+                    writer.close()
+            self._writers.clear()
+        super().close()
+
+
+def read_shard_index(index_path):
+    """
+    샤드 색인 파일 읽기
+    
+    Args:
+        index_path (str): 색인 파일 경로 (.tar.idx)
+    
+    Returns:
+        list: ShardEntry 리스트
+    """
+    entries = []
+    with open(index_path, encoding="utf-8") as f:
+        for line in f:
+            fields = line.rstrip("\n").split("\t", 4)
+            if len(fields) == 5:
+                name, offset, length, sha256, url = fields
+                entries.append(ShardEntry(name, int(offset), int(length), sha256, url))
+    return entries
+
+
+def iter_shard_entries(save_path):
+    """
+    저장 경로의 모든 샤드 색인 항목 (샤드 파일은 열지 않음)
+    
+    Args:
+        save_path (str): 이미지 저장 경로
+    
+    Yields:
+        ShardEntry: 색인 항목
+    """
+    if not os.path.isdir(save_path):
+        return
+    
+    for name in sorted(os.listdir(save_path)):
+        index_path = os.path.join(save_path, name + ShardSink.INDEX_SUFFIX)
+        if SHARD_NAME_PATTERN.match(name) and os.path.exists(index_path):
+            yield from read_shard_index(index_path)
+
+
+class ShardReader:
+    """
+    샤드 파일 읽기
+    
+    샤드를 mmap으로 열어 색인의 위치와 길이로 이미지를 복사 없이 바로 꺼냅니다.
+    """
+    
+    def __init__(self, shard_path):
+        """
+        샤드 열기
+        
+        Args:
+            shard_path (str): 샤드 파일 경로 (.tar)
+        """
+        self.shard_path = shard_path
+        self.entries = read_shard_index(shard_path + ShardSink.INDEX_SUFFIX)
+        self._by_name = {entry.name: entry for entry in self.entries}
+        
+        self._file = open(shard_path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    def read(self, entry):
+        """
+        색인 항목의 이미지 데이터
+        
+        Args:
+            entry (ShardEntry): 색인 항목
+        
+        Returns:
+            memoryview: 이미지 데이터 (mmap을 그대로 참조)
+        """
+        return memoryview(self._mmap)[entry.offset:entry.offset + entry.length]
+    
+    def get(self, name):
+        """
+        이름으로 이미지 데이터 찾기
+        
+        Args:
+            name (str): 이미지 이름 (예: 고양이_1.jpg)
+        
+        Returns:
+            memoryview: 이미지 데이터 (없으면 None)
+        """
+        entry = self._by_name.get(name)
+        if entry is None:
+            return None
+        return self.read(entry)
+    
+    def __iter__(self):
+        for entry in self.entries:
+            yield entry, self.read(entry)
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def close(self):
+        """샤드 닫기 (꺼낸 memoryview가 남아 있으면 mmap은 그 참조가 모두 해제될 때 정리)"""
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+        self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
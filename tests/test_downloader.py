@@ -0,0 +1,64 @@
+"""
+다운로드 엔진 메모리 저장 예산 테스트
+"""
+
+import hashlib
+import os
+import queue
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crawler import ImageResult
+from downloader import DownloadEngine, END_OF_URLS
+from retry_policy import CircuitBreaker
+from sinks import MemorySink
+
+IMAGE_DATA = b"\xff\xd8\xff" + b"\x00" * 97
+
+
+class StubCrawler:
+    """네트워크 없이 고정된 JPEG 데이터를 저장소에 쓰는 크롤러"""
+    
+    def __init__(self, sink):
+        self.sink = sink
+        self.circuit_breaker = CircuitBreaker()
+    
+    def download_image(self, image_url, save_path, filename, cancel_event=None, deadline=None,
+                       raise_errors=False):
+        file_path = os.path.join(save_path, filename)
+        with self.sink.open(file_path, len(IMAGE_DATA)) as f:
+            f.write(IMAGE_DATA)
+        return ImageResult(
+            image_url, file_path, len(IMAGE_DATA), 0.0, 200,
+            hashlib.sha256(IMAGE_DATA).hexdigest(), format="jpeg"
+        )
+    
+    def get_file_extension(self, url):
+        return ".jpg"
+
+
+def test_held_results_do_not_block_stream():
+    # 예산은 이미지 3개분인데 결과를 반납하지 않고 10개를 보관
+    sink = MemorySink(max_bytes=len(IMAGE_DATA) * 3)
+    engine = DownloadEngine(StubCrawler(sink), max_workers=2)
+    
+    url_queue = queue.Queue()
+    for i in range(20):
+        url_queue.put(f"http://127.0.0.1/{i}.jpg")
+    url_queue.put(END_OF_URLS)
+    
+    results = []
+    
+    def consume():
+        results.extend(engine.iter_stream(url_queue, "mem", "cat", 0, num_images=10))
+    
+    thread = threading.Thread(target=consume, daemon=True)
+    thread.start()
+    thread.join(timeout=10)
+    engine.close()
+    
+    assert not thread.is_alive()
+    assert [os.path.basename(result.path) for result in results] == [f"cat_{i}.jpg" for i in range(1, 11)]
+    assert sink.used_bytes == len(IMAGE_DATA) * 10
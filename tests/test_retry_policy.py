@@ -0,0 +1,89 @@
+"""
+회로 차단기 시험 요청 반납 테스트
+"""
+
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import crawler as crawler_module
+from retry_policy import CircuitBreaker
+
+URL = "http://127.0.0.1/cat.jpg"
+
+
+def open_circuit(breaker):
+    """회로를 열고 대기 시간이 지난 상태로 만듦"""
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure(URL)
+    circuit = breaker._hosts["127.0.0.1"]
+    circuit.opened_at -= circuit.reset_timeout
+    return circuit
+
+
+def test_release_returns_probe():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30.0)
+    circuit = open_circuit(breaker)
+    opened_at = circuit.opened_at
+    
+    assert breaker.allow(URL)
+    assert not breaker.allow(URL)
+    
+    breaker.release(URL)
+    assert (circuit.state, circuit.probing) == (CircuitBreaker.OPEN, False)
+    assert circuit.opened_at == opened_at
+    assert circuit.reset_timeout == 30.0
+    assert not breaker.should_skip(URL)
+    assert breaker.allow(URL)
+
+
+def test_release_keeps_closed_circuit():
+    breaker = CircuitBreaker()
+    assert breaker.allow(URL)
+    breaker.release(URL)
+    assert breaker._hosts["127.0.0.1"].state == CircuitBreaker.CLOSED
+
+
+def test_cancelled_probe_is_released():
+    crawler = crawler_module.GoogleImageCrawler(driver=object())
+    crawler.circuit_breaker = CircuitBreaker(failure_threshold=2)
+    circuit = open_circuit(crawler.circuit_breaker)
+    
+    def cancelled_fetch(image_url, file_path, cancel_event=None):
+        raise crawler_module.DownloadCancelledError("다운로드 취소")
+    
+    crawler.fetch_image = cancelled_fetch
+    try:
+        with pytest.raises(crawler_module.DownloadCancelledError):
+            crawler.download_image(URL, "downloads", "cat.jpg", threading.Event())
+    finally:
+        crawler.close()
+    
+    assert (circuit.state, circuit.probing) == (CircuitBreaker.OPEN, False)
+    assert crawler.circuit_breaker.allow(URL)
+
+
+def test_image_deadline_counts_as_host_failure():
+    crawler = crawler_module.GoogleImageCrawler(driver=object())
+    crawler.circuit_breaker = CircuitBreaker(failure_threshold=2)
+    calls = []
+    
+    def slow_fetch(image_url, file_path, cancel_event=None):
+        calls.append(image_url)
+        raise crawler_module.ImageDeadlineError("다운로드 제한 시간 초과: 1초")
+    
+    crawler.fetch_image = slow_fetch
+    try:
+        for _ in range(2):
+            with pytest.raises(crawler_module.ImageDeadlineError):
+                crawler.download_image(URL, "downloads", "cat.jpg", raise_errors=True)
+    finally:
+        crawler.close()
+    
+    # 재시도하지 않고, 두 번 모두 호스트 장애로 기록되어 회로가 열림
+    assert len(calls) == 2
+    assert crawler.circuit_breaker._hosts["127.0.0.1"].state == CircuitBreaker.OPEN
@@ -0,0 +1,323 @@
+"""
+다운로드 후 이미지 변환 단계
+저장한 이미지를 고정 크기 섬네일(JPEG/WebP)로 축소·재인코딩합니다.
+디코딩과 축소는 프로세스 풀에서 실행하므로 다운로드 스레드와 GIL을 다투지 않습니다.
+
+사용법 (기존 다운로드 폴더 일괄 변환):
+    python3 transform.py downloads --size 224 --format webp
+"""
+
+import argparse
+import io
+import multiprocessing
+import os
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, ImageOps
+
+from perceptual import list_images
+
+
+# 섬네일을 저장할 하위 폴더 이름 (키워드 폴더 안)
+THUMBNAIL_DIR = "thumbnails"
+
+# 출력 형식별 확장자
+OUTPUT_EXTENSIONS = {"JPEG": ".jpg", "WEBP": ".webp", "PNG": ".png"}
+
+# 변환 결과 (elapsed는 작업 프로세스에서 디코딩부터 저장까지 걸린 시간)
+TransformResult = namedtuple(
+    "TransformResult",
+    ["source", "output_path", "width", "height", "bytes", "elapsed", "error"]
+)
+
+# 변환 처리량 통계 (wall_time은 첫 제출부터 마지막 완료까지의 실제 시간,
+# cpu_time은 작업 프로세스별 처리 시간의 합)
+TransformStats = namedtuple(
+    "TransformStats",
+    ["count", "failed", "input_bytes", "output_bytes", "wall_time", "cpu_time"]
+)
+
+
+def make_thumbnail(source, output_path, size=224, output_format="JPEG", quality=85, crop=False):
+    """
+    이미지 한 개를 섬네일로 변환하여 저장 (작업 프로세스에서 실행)
+    
+    JPEG는 Image.draft로 디코딩 단계에서 목표 크기에 가깝게 미리 축소하므로,
+    원본 해상도 전체를 디코딩하지 않습니다.
+    
+    Args:
+        source (str | bytes): 원본 이미지 파일 경로 또는 이미지 데이터
+        output_path (str): 섬네일 저장 경로
+        size (int): 긴 변(crop=True면 정사각형 한 변)의 픽셀 수
+        output_format (str): 출력 형식 ("JPEG", "WEBP", "PNG")
+        quality (int): 출력 품질 (JPEG/WebP)
+        crop (bool): True면 가운데를 잘라 size × size로 맞춤, False면 비율 유지
+    
+    Returns:
+        TransformResult: 변환 결과 (실패 시 error에 오류 메시지)
+    """
+    started = time.perf_counter()
+    label = source if isinstance(source, str) else output_path
+    
+    try:
+        with Image.open(source if isinstance(source, str) else io.BytesIO(source)) as image:
+            # 잘라낼 경우 짧은 변 기준으로 size 이상이 되도록 미리 축소
+            if crop:
+                scale = size / min(image.size)
+                draft_size = (int(image.width * scale) + 1, int(image.height * scale) + 1)
+            else:
+                draft_size = (size, size)
+            image.draft("RGB", draft_size)
+            
+            image = ImageOps.exif_transpose(image)
+            if image.mode not in ("RGB", "L"):
+                # 투명 영역은 흰 배경으로 합성 (JPEG는 알파 채널이 없음)
+                rgba = image.convert("RGBA")
+                image = Image.new("RGB", rgba.size, (255, 255, 255))
+                image.paste(rgba, mask=rgba.getchannel("A"))
+            
+            if crop:
+                image = ImageOps.fit(image, (size, size), Image.LANCZOS)
+            else:
+                image.thumbnail((size, size), Image.LANCZOS, reducing_gap=2.0)
+            
+            temp_path = output_path + ".part"
+            image.save(temp_path, output_format, quality=quality)
+            os.replace(temp_path, output_path)
+        
+        return TransformResult(
+            label,
+            output_path,
+            image.width,
+            image.height,
+            os.path.getsize(output_path),
+            time.perf_counter() - started,
+            None
+        )
+    
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        if os.path.exists(output_path + ".part"):
+            os.remove(output_path + ".part")
+        return TransformResult(label, None, None, None, 0, time.perf_counter() - started, str(e))
+
+
+class ThumbnailTransform:
+    """
+    프로세스 풀 기반 섬네일 변환 단계
+    
+    크롤러의 transform으로 넘기면 저장한 이미지를 바로 작업 프로세스에 넘기고
+    다음 다운로드를 계속합니다. 변환 처리량은 네트워크 처리량과 따로 집계합니다.
+    """
+    
+    def __init__(self, size=224, output_format="JPEG", quality=85, crop=False,
+                 workers=None, max_pending=None):
+        """
+        변환 단계 초기화 (프로세스 풀은 처음 변환할 때 생성)
+        
+        Args:
+            size (int): 섬네일 긴 변(crop=True면 정사각형 한 변)의 픽셀 수
+            output_format (str): 출력 형식 ("JPEG", "WEBP", "PNG")
+            quality (int): 출력 품질 (JPEG/WebP)
+            crop (bool): 가운데를 잘라 정사각형으로 맞출지 여부
+            workers (int): 변환 프로세스 수 (None이면 CPU 수)
+            max_pending (int): 완료를 기다리는 최대 작업 수 (넘으면 제출 시 대기,
+                None이면 프로세스 수의 4배)
+        """
+        self.size = size
+        self.output_format = output_format.upper()
+        self.quality = quality
+        self.crop = crop
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * 4
+        
+        self._executor = None
+        self._condition = threading.Condition()
+        self._outstanding = 0
+        self._reset_stats()
+    
+    def _reset_stats(self):
+        """통계 초기화"""
+        self._count = 0
+        self._failed = 0
+        self._input_bytes = 0
+        self._output_bytes = 0
+        self._cpu_time = 0.0
+        self._first_submit = None
+        self._last_done = None
+    
+    def _get_executor(self):
+        """프로세스 풀 생성 (최초 사용 시 한 번만)"""
+        if self._executor is None:
+            # 다운로드 스레드가 실행 중일 때 fork하지 않도록 spawn 사용
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+    
+    def output_path(self, image_path):
+        """
+        원본 이미지 경로에 대응하는 섬네일 경로
+        
+        Args:
+            image_path (str): 원본 이미지 경로 (예: downloads/고양이/고양이_1.png)
+        
+        Returns:
+            str: 섬네일 경로 (예: downloads/고양이/thumbnails/고양이_1.jpg)
+        """
+        directory, filename = os.path.split(image_path)
+        stem = os.path.splitext(filename)[0]
+        return os.path.join(directory, THUMBNAIL_DIR, stem + OUTPUT_EXTENSIONS[self.output_format])
+    
+    def _on_done(self, future, input_bytes):
+        """작업 완료 시 통계 반영 (작업 프로세스 결과를 받는 스레드에서 호출)"""
+        try:
+            result = future.result()
+        except Exception as e:
+            result = TransformResult(None, None, None, None, 0, 0.0, str(e))
+        
+        with self._condition:
+            self._outstanding -= 1
+            self._last_done = time.perf_counter()
+            self._cpu_time += result.elapsed
+            if result.error is None:
+                self._count += 1
+                self._input_bytes += input_bytes
+                self._output_bytes += result.bytes
+            else:
+                self._failed += 1
+            self._condition.notify_all()
+        
+        if result.error is not None:
+            print(f"섬네일 변환 실패 ({result.source}): {result.error}")
+    
+    def submit(self, image_path, data=None):
+        """
+        이미지 한 개 변환 제출 (완료를 기다리는 작업이 많으면 자리가 날 때까지 대기)
+        
+        Args:
+            image_path (str): 저장한 이미지 경로 (data가 없으면 이 파일을 읽음)
+            data (bytes): 메모리에 있는 이미지 데이터 (디스크에 저장하지 않은 경우)
+        
+        Returns:
+            Future: TransformResult를 반환하는 작업
+        """
+        output_path = self.output_path(image_path)
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        
+        if data is not None:
+            source = bytes(data)
+            input_bytes = len(source)
+        else:
+            source = image_path
+            input_bytes = os.path.getsize(image_path)
+        
+        # 완료를 기다리는 작업이 많으면 자리가 날 때까지 대기 (메모리에 쌓이는 작업 수 제한)
+        with self._condition:
+            self._condition.wait_for(lambda: self._outstanding < self.max_pending)
+            self._outstanding += 1
+            if self._first_submit is None:
+                self._first_submit = time.perf_counter()
+        
+        try:
+            future = self._get_executor().submit(
+                make_thumbnail, source, output_path, self.size, self.output_format,
+                self.quality, self.crop
+            )
+        except BaseException:
+            with self._condition:
+                self._outstanding -= 1
+                self._condition.notify_all()
+            raise
+        future.add_done_callback(lambda done: self._on_done(done, input_bytes))
+        return future
+    
+    def wait(self):
+        """제출한 변환이 모두 끝날 때까지 대기"""
+        with self._condition:
+            self._condition.wait_for(lambda: self._outstanding == 0)
+    
+    def take_stats(self):
+        """
+        지금까지의 변환 통계를 반환하고 초기화 (키워드별 집계에 사용)
+        
+        Returns:
+            TransformStats: 변환 개수, 실패 수, 입출력 바이트, 실제 시간, 처리 시간 합
+        """
+        with self._condition:
+            wall_time = (
+                self._last_done - self._first_submit
+                if self._first_submit is not None and self._last_done is not None else 0.0
+            )
+            stats = TransformStats(
+                self._count,
+                self._failed,
+                self._input_bytes,
+                self._output_bytes,
+                wall_time,
+                self._cpu_time
+            )
+            self._reset_stats()
+        return stats
+    
+    def close(self):
+        """남은 변환을 마치고 프로세스 풀 종료"""
+        self.wait()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def format_stats(stats):
+    """
+    변환 통계를 한 줄 요약으로 변환
+    
+    Args:
+        stats (TransformStats): 변환 통계
+    
+    Returns:
+        str: 요약 문자열
+    """
+    rate = stats.count / stats.wall_time if stats.wall_time > 0 else 0.0
+    per_image = stats.cpu_time / (stats.count + stats.failed) if stats.count + stats.failed else 0.0
+    return (
+        f"섬네일 {stats.count}개 (실패 {stats.failed}개), {rate:.1f}장/초, "
+        f"이미지당 {per_image * 1000:.0f}ms, "
+        f"{stats.input_bytes / 1024 / 1024:.1f}MB → {stats.output_bytes / 1024 / 1024:.1f}MB"
+    )
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="다운로드 폴더 이미지를 섬네일로 일괄 변환")
+    parser.add_argument("root_dir", nargs="?", default="downloads", help="다운로드 루트 디렉토리")
+    parser.add_argument("--size", type=int, default=224, help="섬네일 긴 변 픽셀 수")
+    parser.add_argument("--format", dest="output_format", choices=sorted(OUTPUT_EXTENSIONS),
+                        type=str.upper, default="JPEG", help="출력 형식")
+    parser.add_argument("--quality", type=int, default=85, help="출력 품질")
+    parser.add_argument("--crop", action="store_true", help="가운데를 잘라 정사각형으로 맞춤")
+    parser.add_argument("--workers", type=int, help="변환 프로세스 수")
+    args = parser.parse_args()
+    
+    with ThumbnailTransform(args.size, args.output_format, args.quality, args.crop, args.workers) as transform:
+        for entry in sorted(os.scandir(args.root_dir), key=lambda e: e.name):
+            if not entry.is_dir() or entry.name.startswith("."):
+                continue
+            for filename in list_images(entry.path):
+                transform.submit(os.path.join(entry.path, filename))
+        
+        transform.wait()
+        print(format_stats(transform.take_stats()))
+
+
+if __name__ == "__main__":
+    main()